@@ -10,15 +10,19 @@ Returns: A JSON object containing the local path to the extracted XCCDF file and
 import json
 import logging
 import os
+import posixpath
+import re
 import sys
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urljoin
 
 import anyio
-import requests
-from bs4 import BeautifulSoup
+import httpx
 from fastmcp import Context, FastMCP
+from lxml import etree, html
 
 # Environment is automatically loaded by saf_config module
 from ...common.config import ensure_dir, get_download_dir
@@ -32,10 +36,34 @@ mcp = FastMCP("disa-stig-tool")
 # --- Constants ---
 BASE_URL = "https://public.cyber.mil/stigs/downloads/"
 VERSION = "1.0.0"
+HTTP_HEADERS = {"User-Agent": f"DISA-STIG-Tool/{VERSION}"}
+DOWNLOAD_BUFFER_SIZE = 1 << 20  # 1 MiB copy buffer for the STIG zip
+MAX_CONCURRENT_DOWNLOADS = 4  # STIG zips fetched at once by a batch
+DOWNLOADS_PAGE_TTL = 60 * 60  # seconds a parsed downloads page is reused
+
+# File names inside an extracted STIG; the XCCDF check is tried first, so the
+# broader manual pattern only claims the remaining manual XML files
+XCCDF_NAME_RE = re.compile(r"_manual-xccdf\.xml$", re.IGNORECASE)
+MANUAL_NAME_RE = re.compile(r"manual.*\.xml$", re.IGNORECASE)
+
+# Hrefs of links whose text contains $keyword (ASCII case-insensitive) and
+# that point at a .zip, in document order. Compiled once; the filtering runs
+# inside libxml2 rather than in a Python loop over every <a> on the page.
+STIG_LINK_XPATH = etree.XPath(
+    "//a[contains(translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',"
+    " 'abcdefghijklmnopqrstuvwxyz'), $keyword)"
+    " and substring(@href, string-length(@href) - 3) = '.zip']/@href"
+)
 
 # Global variable for CLI-provided product keyword
 CLI_PRODUCT_KEYWORD = None
 
+# Last parsed downloads page and the time.monotonic() it was fetched at
+_PAGE_CACHE = {}
+
+# Default for _fetch_stig's page argument; None is a loaded page with no content
+_PAGE_NOT_LOADED = object()
+
 
 def _get_artifacts_download_dir() -> Path:
     """
@@ -44,101 +72,232 @@ def _get_artifacts_download_dir() -> Path:
     return get_download_dir()
 
 
+VERSION_TEXT = f"DISA STIG Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "DISA STIG Tool",
+    "version": VERSION,
+    "description": "Downloads and extracts DISA STIG packages from public.cyber.mil",
+    "base_url": BASE_URL,
+    "supported_formats": [".zip"],
+    "output_files": ["XCCDF XML", "Manual XML"],
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("disa-stig-tool://version")
 def get_version() -> str:
     """Returns the version of the DISA STIG Tool."""
-    return f"DISA STIG Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("disa-stig-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the DISA STIG Tool."""
-    return {
-        "name": "DISA STIG Tool",
-        "version": VERSION,
-        "description": "Downloads and extracts DISA STIG packages from public.cyber.mil",
-        "base_url": BASE_URL,
-        "supported_formats": [".zip"],
-        "output_files": ["XCCDF XML", "Manual XML"],
-    }
+    return TOOL_INFO_JSON
 
 
-@mcp.tool
-async def fetch_disa_stig(product_keyword: str, ctx: Context) -> str:
+def _new_client() -> httpx.Client:
+    """Returns an HTTP client that sends the tool's headers."""
+    return httpx.Client(headers=HTTP_HEADERS, follow_redirects=True)
+
+
+def _load_downloads_page(client: httpx.Client):
     """
-    Downloads and extracts an official DISA STIG zip package for a given product.
+    Fetches and parses the DISA downloads page (blocking).
 
-    Args:
-        product_keyword: Keyword to find the product STIG (e.g., 'RHEL 9').
+    A parsed page is reused for DOWNLOADS_PAGE_TTL seconds, so repeated
+    lookups only run the XPath query. Returns the parsed document, or None
+    when the page has no content.
+    """
+    now = time.monotonic()
+    if _PAGE_CACHE and now - _PAGE_CACHE["fetched_at"] < DOWNLOADS_PAGE_TTL:
+        return _PAGE_CACHE["page"]
 
-    Returns:
-        A JSON string with a 'status' field indicating success or failure.
-        On success, the 'data' field contains file paths.
-        On failure, the 'message' field contains the error.
+    response = client.get(BASE_URL, timeout=30)
+    response.raise_for_status()
+    try:
+        page = html.fromstring(response.content)
+    except etree.ParserError:
+        # lxml refuses an empty document; there are no links to find in it,
+        # and it is not cached so the next lookup asks DISA again
+        return None
+    _PAGE_CACHE.update(page=page, fetched_at=now)
+    return page
+
+
+def _find_stig_url(page, product_keyword: str) -> str | None:
+    """Returns the absolute URL of the first STIG zip matching the keyword."""
+    if page is None:
+        return None
+    # The keyword is bound as an XPath variable, so quotes in it are safe
+    hrefs = STIG_LINK_XPATH(page, keyword=product_keyword.lower())
+    return urljoin(BASE_URL, hrefs[0]) if hrefs else None
+
+
+def _marker_path(extract_path: Path) -> Path:
     """
-    await ctx.info(f"Starting DISA STIG download for: {product_keyword}")
-    download_dir = _get_artifacts_download_dir()
+    Returns the sidecar file recording that ``extract_path`` extracted cleanly.
+
+    It holds the ETag the zip was served with, or nothing when DISA sent none.
+    """
+    return extract_path.with_name(extract_path.name + ".extracted")
 
+
+def _zip_is_current(
+    client: httpx.Client, stig_url: str, zip_filepath: Path, marker_path: Path
+) -> bool:
+    """
+    Checks with a HEAD request whether the extracted zip matches DISA's (blocking).
+
+    Only a zip whose extraction finished has a marker. A stored ETag is sent as
+    If-None-Match, so a 304 or the same ETag means the copy is current; without
+    one the file size is compared with Content-Length. A failed HEAD or any
+    other answer means the zip should be downloaded.
+    """
+    if not (marker_path.is_file() and zip_filepath.is_file()):
+        return False
+
+    etag = marker_path.read_text()
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        head = client.head(stig_url, headers=headers, timeout=30)
+    except httpx.HTTPError as e:
+        logger.warning("Could not check %s, downloading it again: %s", stig_url, e)
+        return False
+
+    if head.status_code == 304:
+        return True
+    if not head.is_success:
+        return False
+    if etag and "ETag" in head.headers:
+        return head.headers["ETag"] == etag
+    try:
+        return zip_filepath.stat().st_size == int(head.headers["Content-Length"])
+    except (KeyError, ValueError):
+        # No usable size to compare with
+        return False
+
+
+def _extract_zip(zip_filepath: Path, extract_path: Path) -> None:
+    """
+    Extracts every member of the zip, several members at a time (blocking).
+
+    zlib releases the GIL while inflating, so a bundle of many XML files
+    unpacks on all cores. One member per archive directory is extracted first,
+    because ZipFile.extract creates missing parent directories without
+    tolerating another thread creating them at the same moment.
+    """
+    with zipfile.ZipFile(zip_filepath, "r") as zip_ref:
+        pending = []
+        seen_dirs = set()
+        for member in zip_ref.infolist():
+            parent = posixpath.dirname(member.filename)
+            if parent in seen_dirs:
+                pending.append(member)
+            else:
+                seen_dirs.add(parent)
+                zip_ref.extract(member, extract_path)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # list() surfaces the first member that failed to extract
+            list(
+                executor.map(
+                    lambda member: zip_ref.extract(member, extract_path), pending
+                )
+            )
+
+
+async def _fetch_stig(
+    product_keyword: str,
+    ctx: Context,
+    client: httpx.Client,
+    download_dir: Path,
+    page=_PAGE_NOT_LOADED,
+) -> dict:
+    """
+    Finds, downloads and extracts the STIG for one product.
+
+    Loads the downloads page through ``client`` unless the caller already
+    loaded it and passes it as ``page`` (None when it had no content).
+    Returns the tool's result payload as a dict.
+    """
     try:
+        # An empty keyword is contained in every link text, so it would match
+        # whichever STIG the page happens to list first
+        if not product_keyword.strip():
+            error_msg = "A product keyword is required to find a STIG zip file"
+            await ctx.error(error_msg)
+            return {"status": "failure", "message": error_msg}
+
         # 1. Find the STIG download URL
-        await ctx.info(f"Searching for STIG matching: {product_keyword}")
+        if page is _PAGE_NOT_LOADED:
+            await ctx.info(f"Searching for STIG matching: {product_keyword}")
 
-        # Run blocking network I/O in a separate thread
-        response = await anyio.to_thread.run_sync(
-            lambda: requests.get(BASE_URL, timeout=30)
-        )
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        stig_url = None
-        for a_tag in soup.find_all("a", href=True):
-            if product_keyword.lower() in a_tag.text.lower() and a_tag["href"].endswith(
-                ".zip"
-            ):
-                stig_url = urljoin(BASE_URL, a_tag["href"])
-                await ctx.info(f"Found STIG download URL: {stig_url}")
-                break
+            # Run blocking network I/O in a separate thread
+            page = await anyio.to_thread.run_sync(
+                lambda: _load_downloads_page(client)
+            )
+
+        stig_url = _find_stig_url(page, product_keyword)
+        if stig_url:
+            await ctx.info(f"Found STIG download URL: {stig_url}")
 
         if not stig_url:
             error_msg = (
                 f"Could not find a STIG zip file for keyword: '{product_keyword}'"
             )
             await ctx.error(error_msg)
-            return json.dumps({"status": "failure", "message": error_msg})
+            return {"status": "failure", "message": error_msg}
 
-        # 2. Download the zip file
+        # 2. Download the zip file, unless an earlier call already did
         zip_filename = Path(stig_url).name
         zip_filepath = download_dir / zip_filename
+        extract_path = download_dir / product_keyword.replace(" ", "_").lower()
+        marker_path = _marker_path(extract_path)
         ensure_dir(download_dir)
 
-        await ctx.info(f"Downloading {zip_filename}...")
-
-        # Use anyio to run the download in a separate thread
-        def _download_file():
-            with requests.get(stig_url, stream=True, timeout=300) as r:
-                r.raise_for_status()
-                with open(zip_filepath, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
-        await anyio.to_thread.run_sync(_download_file)
-
-        # 3. Extract the zip file
-        extract_path = download_dir / product_keyword.replace(" ", "_").lower()
-        await ctx.info(f"Extracting to {extract_path}...")
+        up_to_date = extract_path.is_dir() and await anyio.to_thread.run_sync(
+            lambda: _zip_is_current(client, stig_url, zip_filepath, marker_path)
+        )
 
-        with zipfile.ZipFile(zip_filepath, "r") as zip_ref:
-            zip_ref.extractall(extract_path)
+        if up_to_date:
+            await ctx.info(f"{zip_filename} is up to date, skipping download.")
+        else:
+            await ctx.info(f"Downloading {zip_filename}...")
+
+            # Use anyio to run the download in a separate thread
+            def _download_file():
+                # A half-written zip or half-extracted tree must never look
+                # current to a later call
+                marker_path.unlink(missing_ok=True)
+                with client.stream("GET", stig_url, timeout=300) as r:
+                    r.raise_for_status()
+                    # Large blocks keep the Python-level write loop short
+                    with open(zip_filepath, "wb") as f:
+                        for chunk in r.iter_bytes(DOWNLOAD_BUFFER_SIZE):
+                            f.write(chunk)
+                    return r.headers.get("ETag")
+
+            etag = await anyio.to_thread.run_sync(_download_file)
+
+            # 3. Extract the zip file
+            await ctx.info(f"Extracting to {extract_path}...")
+
+            await anyio.to_thread.run_sync(
+                lambda: _extract_zip(zip_filepath, extract_path)
+            )
+            # Only a zip that extracted cleanly is recorded as current
+            marker_path.write_text(etag or "")
 
         # 4. Find the necessary files
         xccdf_path, manual_path = None, None
-        for root, _, files in os.walk(extract_path):
-            for file in files:
-                if file.lower().endswith("_manual-xccdf.xml"):
-                    xccdf_path = os.path.join(root, file)
-                elif "manual" in file.lower() and file.lower().endswith(".xml"):
-                    if not file.lower().endswith("_manual-xccdf.xml"):
-                        manual_path = os.path.join(root, file)
+        for path in extract_path.rglob("*.xml", case_sensitive=False):
+            if XCCDF_NAME_RE.search(path.name):
+                xccdf_path = path
+            elif MANUAL_NAME_RE.search(path.name):
+                manual_path = path
+            if xccdf_path and manual_path:
+                break
 
         if not xccdf_path:
             error_msg = (
@@ -146,7 +305,7 @@ async def fetch_disa_stig(product_keyword: str, ctx: Context) -> str:
                 f"{extract_path}."
             )
             await ctx.error(error_msg)
-            return json.dumps({"status": "failure", "message": error_msg})
+            return {"status": "failure", "message": error_msg}
 
         result_paths = {
             "xccdf_path": str(xccdf_path),
@@ -154,26 +313,109 @@ async def fetch_disa_stig(product_keyword: str, ctx: Context) -> str:
         }
 
         await ctx.info("Successfully completed DISA STIG download and extraction.")
-        return json.dumps({"status": "success", "data": result_paths})
+        return {"status": "success", "data": result_paths}
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error during download: {e}"
         logger.error(error_msg, exc_info=True)
         await ctx.error(error_msg)
-        return json.dumps({"status": "failure", "message": error_msg})
+        return {"status": "failure", "message": error_msg}
 
     except zipfile.BadZipFile as e:
         error_msg = f"Failed to open STIG zip file. It may be corrupt. {e}"
         logger.error(error_msg, exc_info=True)
         await ctx.error(error_msg)
-        return json.dumps({"status": "failure", "message": error_msg})
+        return {"status": "failure", "message": error_msg}
 
     except (OSError, IOError, ValueError) as e:
         # Catch file system and other common errors
         error_msg = f"File system or processing error: {e}"
         logger.error("File system error in fetch_disa_stig: %s", e, exc_info=True)
         await ctx.error(error_msg)
-        return json.dumps({"status": "failure", "message": error_msg})
+        return {"status": "failure", "message": error_msg}
+
+
+@mcp.tool
+async def fetch_disa_stig(product_keyword: str, ctx: Context) -> str:
+    """
+    Downloads and extracts an official DISA STIG zip package for a given product.
+
+    Args:
+        product_keyword: Keyword to find the product STIG (e.g., 'RHEL 9').
+
+    Returns:
+        A JSON string with a 'status' field indicating success or failure.
+        On success, the 'data' field contains file paths.
+        On failure, the 'message' field contains the error.
+    """
+    await ctx.info(f"Starting DISA STIG download for: {product_keyword}")
+    download_dir = _get_artifacts_download_dir()
+
+    # The downloads page and the zip are on the same host, so one client
+    # lets the download reuse the page request's connection and TLS setup
+    with _new_client() as client:
+        result = await _fetch_stig(product_keyword, ctx, client, download_dir)
+    return json.dumps(result)
+
+
+@mcp.tool
+async def fetch_many_disa_stigs(product_keywords: list[str], ctx: Context) -> str:
+    """
+    Downloads and extracts the DISA STIGs for several products concurrently.
+
+    The downloads page is fetched and parsed once for the whole batch, and up
+    to MAX_CONCURRENT_DOWNLOADS zips are downloaded at the same time. Keywords
+    that resolve to the same zip are fetched one after another, so they never
+    write the same file at once.
+
+    Args:
+        product_keywords: Keywords to find each product STIG (e.g., ['RHEL 9']).
+
+    Returns:
+        A JSON string with a 'status' field that is 'success' only if every
+        product succeeded, and a 'results' field mapping each keyword to the
+        result fetch_disa_stig would have returned for it.
+    """
+    keywords = list(dict.fromkeys(product_keywords))
+    await ctx.info(f"Starting DISA STIG download for {len(keywords)} products")
+    download_dir = _get_artifacts_download_dir()
+    limiter = anyio.CapacityLimiter(MAX_CONCURRENT_DOWNLOADS)
+    results = {}
+
+    async def fetch_group(group):
+        async with limiter:
+            for keyword in group:
+                results[keyword] = await _fetch_stig(
+                    keyword, ctx, client, download_dir, page
+                )
+
+    with _new_client() as client:
+        try:
+            page = await anyio.to_thread.run_sync(
+                lambda: _load_downloads_page(client)
+            )
+        except httpx.HTTPError as e:
+            error_msg = f"Network error during download: {e}"
+            logger.error(error_msg, exc_info=True)
+            await ctx.error(error_msg)
+            return json.dumps({"status": "failure", "message": error_msg})
+
+        # Group the keywords by the zip they resolve to (None: no match)
+        groups = {}
+        for keyword in keywords:
+            groups.setdefault(_find_stig_url(page, keyword), []).append(keyword)
+
+        async with anyio.create_task_group() as tg:
+            for group in groups.values():
+                tg.start_soon(fetch_group, group)
+
+    all_ok = all(result["status"] == "success" for result in results.values())
+    return json.dumps(
+        {
+            "status": "success" if all_ok else "failure",
+            "results": {keyword: results[keyword] for keyword in keywords},
+        }
+    )
 
 
 @mcp.tool
@@ -42,30 +42,35 @@ VERSION = "1.0.0"
 CLI_PRODUCT_KEYWORD = None
 
 
+VERSION_TEXT = f"Docker Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "Docker Tool",
+    "version": VERSION,
+    "description": "Manages Docker images and containers for test environments",
+    "capabilities": [
+        "Search Docker Hub repositories",
+        "Pull Docker images",
+        "Export Docker images to tar files",
+        "List local Docker images",
+        "Remove Docker images",
+        "Save image metadata to artifacts directory",
+    ],
+    "required_dependencies": ["docker", "requests", "fastmcp"],
+    "supported_transports": ["stdio", "sse", "http"],
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("docker-tool://version")
 def get_version() -> str:
     """Returns the version of the Docker Tool."""
-    return f"Docker Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("docker-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the Docker Tool."""
-    return {
-        "name": "Docker Tool",
-        "version": VERSION,
-        "description": "Manages Docker images and containers for test environments",
-        "capabilities": [
-            "Search Docker Hub repositories",
-            "Pull Docker images",
-            "Export Docker images to tar files",
-            "List local Docker images",
-            "Remove Docker images",
-            "Save image metadata to artifacts directory",
-        ],
-        "required_dependencies": ["docker", "requests", "fastmcp"],
-        "supported_transports": ["stdio", "sse", "http"],
-    }
+    return TOOL_INFO_JSON
 
 
 def _get_artifacts_download_dir() -> Path:
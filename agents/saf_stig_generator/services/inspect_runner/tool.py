@@ -22,24 +22,29 @@ mcp = FastMCP("inspec-runner-tool")
 VERSION = "1.0.0"
 
 
+VERSION_TEXT = f"InSpec Runner Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "InSpec Runner Tool",
+    "version": VERSION,
+    "description": "Executes InSpec tests against targets and returns results",
+    "cli_tool": "inspec",
+    "installation": "Chef InSpec installation required",
+    "supported_targets": ["docker://container", "ssh://host", "local://"],
+    "output_format": "JSON test results",
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("inspec-runner-tool://version")
 def get_version() -> str:
     """Returns the version of the InSpec Runner Tool."""
-    return f"InSpec Runner Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("inspec-runner-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the InSpec Runner Tool."""
-    return {
-        "name": "InSpec Runner Tool",
-        "version": VERSION,
-        "description": "Executes InSpec tests against targets and returns results",
-        "cli_tool": "inspec",
-        "installation": "Chef InSpec installation required",
-        "supported_targets": ["docker://container", "ssh://host", "local://"],
-        "output_format": "JSON test results",
-    }
+    return TOOL_INFO_JSON
 
 
 @mcp.tool
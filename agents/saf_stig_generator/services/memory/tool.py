@@ -40,29 +40,34 @@ mcp = FastMCP("memory-tool")
 VERSION = "1.0.0"
 
 
+VERSION_TEXT = f"Memory Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "Memory Tool",
+    "version": VERSION,
+    "description": "Manages long-term memory of InSpec controls using ChromaDB",
+    "database": "ChromaDB",
+    "collections": {
+        "validated_examples": "Pretrained baseline examples",
+        "saf_documentation": "SAF documentation",
+        "saf_inspec_controls": "Legacy collection",
+    },
+    "functions": ["add_to_memory", "query_memory", "manage_baseline_memory_mcp"],
+    "storage_format": "Vector embeddings",
+    "storage_path": CHROMA_DB_PATH,
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("memory-tool://version")
 def get_version() -> str:
     """Returns the version of the Memory Tool."""
-    return f"Memory Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("memory-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the Memory Tool."""
-    return {
-        "name": "Memory Tool",
-        "version": VERSION,
-        "description": "Manages long-term memory of InSpec controls using ChromaDB",
-        "database": "ChromaDB",
-        "collections": {
-            "validated_examples": "Pretrained baseline examples",
-            "saf_documentation": "SAF documentation",
-            "saf_inspec_controls": "Legacy collection",
-        },
-        "functions": ["add_to_memory", "query_memory", "manage_baseline_memory_mcp"],
-        "storage_format": "Vector embeddings",
-        "storage_path": CHROMA_DB_PATH,
-    }
+    return TOOL_INFO_JSON
 
 
 # --- ChromaDB Client Initialization ---
@@ -53,28 +53,33 @@ def _get_artifacts_download_dir() -> Path:
 
 
 # --- MCP Resources ---
+VERSION_TEXT = f"MITRE Baseline Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "MITRE Baseline Tool",
+    "version": VERSION,
+    "description": TOOL_DESCRIPTION,
+    "capabilities": [
+        "Search GitHub repositories",
+        "Clone MITRE baseline repositories",
+        "Handle paginated API responses",
+        "Support GitHub token authentication",
+    ],
+    "required_dependencies": ["git", "requests", "fastmcp", "anyio"],
+    "supported_transports": ["stdio", "sse", "http"],
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("mitre-baseline-tool://version")
 def get_version() -> str:
     """Returns the version of the MITRE Baseline Tool."""
-    return f"MITRE Baseline Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("mitre-baseline-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the MITRE Baseline Tool."""
-    return {
-        "name": "MITRE Baseline Tool",
-        "version": VERSION,
-        "description": TOOL_DESCRIPTION,
-        "capabilities": [
-            "Search GitHub repositories",
-            "Clone MITRE baseline repositories",
-            "Handle paginated API responses",
-            "Support GitHub token authentication",
-        ],
-        "required_dependencies": ["git", "requests", "fastmcp", "anyio"],
-        "supported_transports": ["stdio", "sse", "http"],
-    }
+    return TOOL_INFO_JSON
 
 
 async def _get_all_repos_async(
@@ -23,24 +23,29 @@ mcp = FastMCP("saf-generator-tool")
 VERSION = "1.0.0"
 
 
+VERSION_TEXT = f"SAF Generator Tool v{VERSION}"
+TOOL_INFO = {
+    "name": "SAF Generator Tool",
+    "version": VERSION,
+    "description": "Wraps the @mitre/saf CLI to generate InSpec stubs from DISA XCCDF files",
+    "cli_tool": "@mitre/saf",
+    "installation": "npm install -g @mitre/saf",
+    "supported_formats": [".xml"],
+    "output_format": "InSpec Ruby files",
+}
+TOOL_INFO_JSON = json.dumps(TOOL_INFO, indent=2)
+
+
 @mcp.resource("saf-generator-tool://version")
 def get_version() -> str:
     """Returns the version of the SAF Generator Tool."""
-    return f"SAF Generator Tool v{VERSION}"
+    return VERSION_TEXT
 
 
 @mcp.resource("saf-generator-tool://info")
-def get_info() -> dict:
+def get_info() -> str:
     """Returns information about the SAF Generator Tool."""
-    return {
-        "name": "SAF Generator Tool",
-        "version": VERSION,
-        "description": "Wraps the @mitre/saf CLI to generate InSpec stubs from DISA XCCDF files",
-        "cli_tool": "@mitre/saf",
-        "installation": "npm install -g @mitre/saf",
-        "supported_formats": [".xml"],
-        "output_format": "InSpec Ruby files",
-    }
+    return TOOL_INFO_JSON
 
 
 @mcp.tool
@@ -2,26 +2,26 @@
 CLI Testing utilities for MCP tools.
 """
 
-import subprocess
 import sys
 from pathlib import Path
 from typing import List
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.common.cli import run_cli  # noqa: E402
+
 
 class MCPToolCLITester:
     """Helper class for testing MCP tool CLI functionality."""
 
-    def __init__(self, tool_path: Path):
-        self.tool_path = tool_path
-
-    def run_command(self, args: List[str], timeout: int = 10) -> dict:
-        """Run a CLI command and return results."""
-        cmd = [sys.executable, str(self.tool_path)] + args
+    def __init__(self, tool_module: str):
+        self.tool_module = tool_module
 
+    def run_command(self, args: List[str]) -> dict:
+        """Run a CLI command in this interpreter and return results."""
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=timeout
-            )
+            result = run_cli(self.tool_module, *args)
 
             return {
                 "returncode": result.returncode,
@@ -29,13 +29,6 @@ class MCPToolCLITester:
                 "stderr": result.stderr,
                 "success": result.returncode == 0,
             }
-        except subprocess.TimeoutExpired:
-            return {
-                "returncode": -1,
-                "stdout": "",
-                "stderr": "Command timed out",
-                "success": False,
-            }
         except Exception as e:
             return {"returncode": -1, "stdout": "", "stderr": str(e), "success": False}
 
@@ -61,18 +54,16 @@ class MCPToolCLITester:
 
 def test_all_tools_cli():
     """Test CLI functionality for all MCP tools."""
-    tools_dir = (
-        Path(__file__).parent.parent / "agents" / "saf_stig_generator" / "services"
-    )
+    tools_dir = PROJECT_ROOT / "agents" / "saf_stig_generator" / "services"
 
     test_results = {}
 
     for tool_dir in tools_dir.iterdir():
         if tool_dir.is_dir() and (tool_dir / "tool.py").exists():
             tool_name = tool_dir.name
-            tool_path = tool_dir / "tool.py"
+            tool_module = f"agents.saf_stig_generator.services.{tool_name}.tool"
 
-            tester = MCPToolCLITester(tool_path)
+            tester = MCPToolCLITester(tool_module)
 
             test_results[tool_name] = {
                 "help": tester.test_help(),
@@ -0,0 +1,56 @@
+"""
+In-process runner for the service tools' command-line entry points.
+"""
+
+import contextlib
+import io
+import runpy
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+from fastmcp import FastMCP
+
+__all__ = ["run_cli"]
+
+
+class _ServerStarted(Exception):
+    """Raised in place of ``FastMCP.run`` while a tool's ``__main__`` runs."""
+
+
+def _refuse_to_serve(server, *args, **kwargs):
+    raise _ServerStarted(f"{server.name} tried to start its MCP server")
+
+
+def run_cli(module, *args):
+    """
+    Run ``module`` like ``python -m module *args`` would, in this interpreter.
+
+    Avoids starting a second Python process just to print --help/--version;
+    argparse exits through SystemExit, which carries the exit code. Entry
+    points that would go on to serve (no argparse, or arguments other than
+    --help/--version) are stopped at ``FastMCP.run`` and reported as exit
+    code 1 instead of blocking. Returns a namespace with ``returncode``,
+    ``stdout`` and ``stderr`` like ``subprocess.run`` does.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [module, *args]
+    returncode = 0
+    try:
+        with (
+            mock.patch.object(FastMCP, "run", _refuse_to_serve),
+            contextlib.redirect_stdout(stdout),
+            contextlib.redirect_stderr(stderr),
+        ):
+            runpy.run_module(module, run_name="__main__")
+    except SystemExit as e:
+        returncode = e.code or 0
+    except _ServerStarted as e:
+        stderr.write(f"{e}\n")
+        returncode = 1
+    finally:
+        sys.argv = saved_argv
+    return SimpleNamespace(
+        returncode=returncode, stdout=stdout.getvalue(), stderr=stderr.getvalue()
+    )
@@ -0,0 +1,29 @@
+"""
+Lightweight stand-ins for the FastMCP ``Context`` passed to tools under test.
+"""
+
+
+class CtxStub:
+    """
+    Records the messages a tool logs through ``ctx.info``/``error``/``debug``.
+
+    Unlike ``AsyncMock`` it builds no child mocks and no call objects; each
+    call just appends the message to a plain list.
+    """
+
+    def __init__(self):
+        self.info_calls = []
+        self.error_calls = []
+        self.debug_calls = []
+
+    async def info(self, message):
+        self.info_calls.append(message)
+
+    async def error(self, message):
+        self.error_calls.append(message)
+
+    async def debug(self, message):
+        self.debug_calls.append(message)
+
+    def assert_any_info(self, message):
+        assert message in self.info_calls, f"{message!r} not in {self.info_calls!r}"
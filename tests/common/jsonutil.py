@@ -0,0 +1,10 @@
+"""
+JSON parsing for test assertions: ``orjson`` when installed, stdlib otherwise.
+"""
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+__all__ = ["loads"]
@@ -2,13 +2,16 @@
 Shared pytest configuration and fixtures for testing MCP tools.
 """
 
-import asyncio
+import importlib
+import json
 
 # Add the project root to the Python path
 import sys
-import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import AsyncMock
+from types import MappingProxyType, SimpleNamespace
+from typing import Mapping
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 import respx
@@ -16,44 +19,69 @@ import respx
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from tests.common.context import CtxStub  # noqa: E402
 
-@pytest.fixture
-def temp_artifacts_dir():
-    """Create temporary artifacts directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
-
-
-@pytest.fixture
-def mock_context():
-    """Mock MCP context for testing."""
-    context = AsyncMock()
-    context.info = AsyncMock()
-    context.error = AsyncMock()
-    context.debug = AsyncMock()
-    return context
+# Import paths of the MCP service tool modules, keyed by short name
+TOOL_MODULE_PATHS = {
+    "disa": "agents.saf_stig_generator.services.disa_stig.tool",
+    "docker": "agents.saf_stig_generator.services.docker.tool",
+    "inspec": "agents.saf_stig_generator.services.inspect_runner.tool",
+    "memory": "agents.saf_stig_generator.services.memory.tool",
+    "mitre": "agents.saf_stig_generator.services.mitre_baseline.tool",
+    "saf": "agents.saf_stig_generator.services.saf_generator.tool",
+}
 
 
-@pytest.fixture
-def sample_stig_data():
-    """Sample STIG XCCDF data for testing."""
-    return """<?xml version="1.0" encoding="UTF-8"?>
-<Benchmark xmlns="http://checklists.nist.gov/xccdf/1.1"
-           id="RHEL_9_STIG">
-    <title>Red Hat Enterprise Linux 9 Security Technical Implementation Guide</title>
-    <Group id="V-230222">
-        <title>RHEL 9 must be vendor supported</title>
-        <Rule id="SV-230222r627750_rule" severity="high">
-            <title>The RHEL 9 operating system must be a vendor-supported release.</title>
-        </Rule>
-    </Group>
-</Benchmark>"""
+class _ToolModules:
+    """
+    Lazy, process-wide namespace of the service tool modules.
 
+    Each module is imported on first attribute access and then cached on the
+    instance, so a worker only pays for the tool modules its tests touch.
+    """
 
-@pytest.fixture
-def sample_inspec_control():
-    """Sample InSpec control for testing."""
-    return """
+    def __getattr__(self, name):
+        try:
+            module_path = TOOL_MODULE_PATHS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        module = importlib.import_module(module_path)
+        setattr(self, name, module)
+        return module
+
+
+tools = _ToolModules()
+
+
+@dataclass(frozen=True)
+class InspecControl:
+    """Immutable, pre-parsed view of an InSpec control used as test data."""
+
+    id: str
+    title: str
+    impact: float
+    tags: Mapping[str, object]
+    code: str
+
+
+SAMPLE_INSPEC_CONTROL = InspecControl(
+    id="V-230222",
+    title="The RHEL 9 operating system must be a vendor-supported release.",
+    impact=1.0,
+    tags=MappingProxyType(
+        {
+            "severity": "high",
+            "gtitle": "SRG-OS-000480-GPOS-00227",
+            "gid": "V-230222",
+            "rid": "SV-230222r627750_rule",
+            "stig_id": "RHEL-09-211010",
+            "fix_id": "F-32866r567462_fix",
+            "cci": ("CCI-000366",),
+            "nist": ("CM-6 b",),
+            "host": True,
+        }
+    ),
+    code="""
 control 'V-230222' do
   title 'The RHEL 9 operating system must be a vendor-supported release.'
   desc 'An operating system release that is not supported by the vendor...'
@@ -72,30 +100,105 @@ control 'V-230222' do
     it { should be_supported }
   end
 end
-"""
+""",
+)
+
+# GitHub repository search result for the RHEL 9 baseline, plus its JSON body
+GITHUB_SEARCH_RESPONSE = {
+    "items": [
+        {
+            "name": "redhat-enterprise-linux-9-stig-baseline",
+            "html_url": "https://github.com/mitre/redhat-enterprise-linux-9-stig-baseline",
+            "clone_url": "https://github.com/mitre/redhat-enterprise-linux-9-stig-baseline.git",
+            "description": "MITRE InSpec Profile for Red Hat Enterprise Linux 9 STIG",
+        }
+    ]
+}
+GITHUB_SEARCH_BODY = json.dumps(GITHUB_SEARCH_RESPONSE).encode()
+
+
+@pytest.fixture(scope="session")
+def tool_modules():
+    """Session-wide lazy access to the service tool modules."""
+    return tools
+
+
+@pytest.fixture(scope="session")
+def temp_artifacts_dir(tmp_path_factory):
+    """Shared temporary artifacts directory for tests that only read the path."""
+    return tmp_path_factory.mktemp("artifacts")
 
 
 @pytest.fixture
-def mock_github_api_response():
-    """Mock GitHub API response for baseline search."""
-    return {
-        "items": [
-            {
-                "name": "redhat-enterprise-linux-9-stig-baseline",
-                "html_url": "https://github.com/mitre/redhat-enterprise-linux-9-stig-baseline",
-                "clone_url": "https://github.com/mitre/redhat-enterprise-linux-9-stig-baseline.git",
-                "description": "MITRE InSpec Profile for Red Hat Enterprise Linux 9 STIG",
-            }
-        ]
-    }
+def isolated_artifacts_dir(tmp_path_factory):
+    """Fresh numbered artifacts directory for tests that write files."""
+    return tmp_path_factory.mktemp("artifacts", numbered=True)
+
+
+@pytest.fixture
+def mock_context():
+    """Mock MCP context for testing.
+
+    Only the awaited logging/progress methods are mocked; the namespace itself
+    is a plain object, so unknown attributes raise instead of auto-creating.
+    """
+    return SimpleNamespace(
+        **{
+            name: AsyncMock()
+            for name in ("info", "error", "warning", "debug", "report_progress")
+        }
+    )
+
+
+@pytest.fixture
+def mock_subprocess(monkeypatch):
+    """MagicMock standing in for ``subprocess.run`` during one test.
+
+    The InSpec runner, MITRE baseline and SAF generator tools all call
+    ``subprocess.run`` on the shared ``subprocess`` module, so one monkeypatch
+    covers each of them; tests set ``return_value``/``side_effect`` on it.
+    """
+    run = MagicMock()
+    monkeypatch.setattr("subprocess.run", run)
+    return run
+
+
+@pytest.fixture
+def ctx_stub():
+    """Recording context stub; cheaper than ``mock_context`` for hot tool calls."""
+    return CtxStub()
+
+
+@pytest.fixture
+def sample_stig_data():
+    """Sample STIG XCCDF data for testing."""
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<Benchmark xmlns="http://checklists.nist.gov/xccdf/1.1"
+           id="RHEL_9_STIG">
+    <title>Red Hat Enterprise Linux 9 Security Technical Implementation Guide</title>
+    <Group id="V-230222">
+        <title>RHEL 9 must be vendor supported</title>
+        <Rule id="SV-230222r627750_rule" severity="high">
+            <title>The RHEL 9 operating system must be a vendor-supported release.</title>
+        </Rule>
+    </Group>
+</Benchmark>"""
+
+
+@pytest.fixture(scope="session")
+def sample_inspec_control():
+    """Sample InSpec control for testing, parsed once at import time."""
+    return SAMPLE_INSPEC_CONTROL
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def mock_github_api_response():
+    """Mock GitHub API response for baseline search.
+
+    ``data`` is the decoded payload for assertions and ``body`` the same JSON
+    encoded once, for mocked responses that serve it as raw content.
+    """
+    return SimpleNamespace(data=GITHUB_SEARCH_RESPONSE, body=GITHUB_SEARCH_BODY)
 
 
 # HTML fixtures for mocking web responses
@@ -136,22 +239,9 @@ def mock_http_api():
 
 @pytest.fixture
 def mock_chromadb_collection():
-    """Mock ChromaDB collection for memory tool tests."""
-    from unittest.mock import MagicMock
+    """Mock ChromaDB collection for memory tool tests.
 
-    collection = MagicMock()
-    collection.add = MagicMock()
-    collection.query = MagicMock()
-    return collection
-
-
-@pytest.fixture
-def mock_docker_client():
-    """Mock Docker client for docker tool tests."""
-    from unittest.mock import MagicMock
-
-    client = MagicMock()
-    client.ping.return_value = True
-    client.images = MagicMock()
-    client.images.pull = MagicMock()
-    return client
+    The memory tool only calls ``add`` and ``query``, so a namespace of two
+    Mocks is enough and avoids MagicMock's auto-created attribute chains.
+    """
+    return SimpleNamespace(add=Mock(), query=Mock())
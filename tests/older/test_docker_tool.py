@@ -1,135 +0,0 @@
-"""
-Tests for Docker Tool - comprehensive unit and integration tests.
-"""
-
-import json
-from unittest.mock import MagicMock, patch
-
-import pytest
-from fastmcp import Client
-
-from agents.saf_stig_generator.services.docker.tool import (
-    fetch_docker_image,
-)
-from agents.saf_stig_generator.services.docker.tool import (
-    mcp as docker_server,
-)
-
-
-class TestDockerTool:
-    """Unit tests for Docker tool functionality."""
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.docker.tool.docker.from_env")
-    async def test_fetch_docker_image_success(self, mock_docker_env, mock_context):
-        """Test successful Docker image fetching."""
-        # Mock Docker client
-        mock_client = MagicMock()
-        mock_docker_env.return_value = mock_client
-        mock_client.ping.return_value = True
-
-        # Mock successful image pull
-        mock_image = MagicMock()
-        mock_image.tags = ["rhel9:latest"]
-        mock_client.images.pull.return_value = mock_image
-
-        result_str = await fetch_docker_image("rhel9", mock_context)
-        result = json.loads(result_str)
-
-        # Check if the result follows the expected structure
-        # The actual tool returns different formats, so check for common success indicators
-        assert (
-            result.get("status") == "success" or "data" in result or "image" in result
-        )
-        mock_client.ping.assert_called_once()
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.docker.tool.docker.from_env")
-    async def test_fetch_docker_image_docker_daemon_error(
-        self, mock_docker_env, mock_context
-    ):
-        """Test handling of Docker daemon connection errors."""
-        import docker
-
-        # Mock Docker connection failure
-        mock_docker_env.side_effect = docker.errors.DockerException(
-            "Docker daemon not running"
-        )
-
-        result_str = await fetch_docker_image("test_image", mock_context)
-        result = json.loads(result_str)
-
-        # The tool returns an error key for Docker daemon issues
-        assert "error" in result
-        assert "Docker daemon" in result["error"]
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.docker.tool.docker.from_env")
-    async def test_fetch_docker_image_not_found(self, mock_docker_env, mock_context):
-        """Test handling when Docker image is not found."""
-        import docker
-
-        # Mock Docker client
-        mock_client = MagicMock()
-        mock_docker_env.return_value = mock_client
-        mock_client.ping.return_value = True
-
-        # Mock image not found error
-        mock_client.images.pull.side_effect = docker.errors.ImageNotFound(
-            "Image not found"
-        )
-
-        result_str = await fetch_docker_image("nonexistent_image", mock_context)
-        result = json.loads(result_str)
-
-        # Check for error indication (could be error key or failure status)
-        assert "error" in result or result.get("status") == "failure"
-
-
-class TestDockerToolIntegration:
-    """Integration tests for Docker tool using FastMCP Client."""
-
-    @pytest.fixture
-    def mcp_server(self):
-        """Provide the Docker MCP server for testing."""
-        return docker_server
-
-    @pytest.mark.asyncio
-    async def test_tool_via_mcp_client(self, mcp_server):
-        """Test the tool through MCP client interface."""
-        with patch(
-            "agents.saf_stig_generator.services.docker.tool.docker.from_env"
-        ) as mock_docker:
-            mock_client = MagicMock()
-            mock_docker.return_value = mock_client
-            mock_client.ping.return_value = True
-
-            mock_image = MagicMock()
-            mock_image.tags = ["test:latest"]
-            mock_client.images.pull.return_value = mock_image
-
-            async with Client(mcp_server) as client:
-                result_content, _ = await client.call_tool(
-                    "fetch_docker_image", {"product_keyword": "test"}
-                )
-                result = json.loads(result_content.text)
-
-                # Basic check that some result was returned
-                assert isinstance(result, dict)
-
-    @pytest.mark.asyncio
-    async def test_tool_resources(self, mcp_server):
-        """Test tool resources are accessible."""
-        async with Client(mcp_server) as client:
-            # Test version resource
-            version_result = await client.read_resource("docker-tool://version")
-            assert "Docker Tool v" in version_result.text
-
-            # Test info resource (if available)
-            try:
-                info_result = await client.read_resource("docker-tool://info")
-                info_data = json.loads(info_result.text)
-                assert "name" in info_data
-            except Exception:
-                # Info resource might not be implemented
-                pass
@@ -3,56 +3,82 @@
 Comprehensive test runner for SAF STIG Generator MCP tools.
 """
 
-import subprocess
+import argparse
+import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 
-def run_tests():
-    """Run all tests for the MCP tools."""
+def run_tests(slow=False):
+    """Run the fast lane of the MCP tool tests, or only the slow lane if ``slow``."""
+    # Imported here so check_dependencies() can report a missing pytest
+    import pytest
+
     test_dir = Path(__file__).parent
     project_root = test_dir.parent
 
     print("🧪 Running SAF STIG Generator MCP Tools Tests")
     print("=" * 50)
 
-    # Change to project root
-    import os
-
-    os.chdir(project_root)
-
-    # Add project root to Python path
-    sys.path.insert(0, str(project_root))
+    # pytest runs in this interpreter, so anchor paths at the project root
+    # instead of chdir-ing into it.
+    rootdir = f"--rootdir={project_root}"
 
-    # Test commands to run
-    test_commands = [
+    # Every suite goes into one pytest.main() call: xdist then balances files
+    # from all of them across the same workers, and pytest is never re-run in
+    # an interpreter that already imported the test modules.
+    test_paths = [
         # Unit tests for all services
-        ["python", "-m", "pytest", "tests/services/", "-v", "--tb=short"],
+        str(test_dir / "services"),
+        # Testing-pattern checks; the name is outside pytest's test_*.py
+        # pattern, so the file is listed explicitly
+        str(test_dir / "validate_testing_improvements.py"),
         # Integration tests (if they exist)
-        # ["python", "-m", "pytest", "tests/integration/", "-v", "--tb=short"],
+        # str(test_dir / "integration"),
+    ]
+    # Put the tmp_path/tmp_path_factory trees (baselines, artifacts, STIG
+    # zips) on tmpfs when the host has one; an explicit PYTEST_DEBUG_TEMPROOT
+    # wins. The xdist workers inherit the environment.
+    if os.path.isdir("/dev/shm"):
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+    # Shard across CPU cores. loadgroup keeps each xdist_group (modules that
+    # share a module-scoped respx router or Client) on one worker and spreads
+    # everything else. SAF_TEST_JOBS pins the worker count (0 runs serially).
+    jobs = os.environ.get("SAF_TEST_JOBS", "auto")
+    # The last -m wins over the 'not integration and not benchmark' default in
+    # pyproject.toml, so the lane expressions repeat it.
+    lane = "slow" if slow else "not slow"
+    args = [
+        rootdir,
+        *test_paths,
+        "-m",
+        f"{lane} and not integration and not benchmark",
+        "-n",
+        jobs,
+        "--dist",
+        "loadgroup",
+        "-v",
+        "--tb=short",
         # Run with coverage if available
-        # ["python", "-m", "pytest", "tests/", "--cov=agents", "--cov-report=term-missing"],
+        # "--cov=agents",
+        # "--cov-report=term-missing",
     ]
 
-    for i, cmd in enumerate(test_commands, 1):
-        print(f"\n📋 Running test command {i}/{len(test_commands)}:")
-        print(f"   {' '.join(cmd)}")
-        print("-" * 30)
-
-        try:
-            result = subprocess.run(cmd, capture_output=False, text=True)
-            if result.returncode != 0:
-                print(f"❌ Test command {i} failed with exit code {result.returncode}")
-                return False
-            else:
-                print(f"✅ Test command {i} passed")
-        except FileNotFoundError as e:
-            print(f"❌ Command not found: {e}")
-            print("   Make sure pytest is installed: pip install pytest pytest-asyncio")
-            return False
-        except Exception as e:
-            print(f"❌ Error running tests: {e}")
-            return False
+    print("\n📋 Running test suite:")
+    print(f"   pytest {' '.join(args)}")
+    print("-" * 30)
+
+    try:
+        rc = pytest.main(args)
+    except Exception as e:
+        print(f"❌ Error running tests: {e}")
+        return False
+
+    if rc != pytest.ExitCode.OK:
+        print(f"❌ Test run failed with exit code {int(rc)}")
+        return False
 
     print("\n🎉 All tests completed successfully!")
     return True
@@ -62,20 +88,22 @@ def check_dependencies():
     """Check if required test dependencies are available."""
     print("🔍 Checking test dependencies...")
 
-    required_packages = [
-        "pytest",
-        "pytest-asyncio",
-        "fastmcp",
+    # Distribution name -> import name
+    required_packages = {
+        "pytest": "pytest",
+        "pytest-asyncio": "pytest_asyncio",
+        "pytest-xdist": "xdist",
+        "fastmcp": "fastmcp",
         # Note: respx and other packages might not be installed yet
-    ]
+    }
 
     missing_packages = []
 
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
+    # find_spec only consults the import finders; nothing is executed.
+    for package, module_name in required_packages.items():
+        if find_spec(module_name) is not None:
             print(f"   ✅ {package}")
-        except ImportError:
+        else:
             print(f"   ❌ {package}")
             missing_packages.append(package)
 
@@ -93,13 +121,21 @@ def main():
     print("SAF STIG Generator - MCP Tools Test Suite")
     print("=========================================")
 
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--slow",
+        action="store_true",
+        help="Run only the tests marked slow (default: everything else)",
+    )
+    args = parser.parse_args()
+
     # Check dependencies first
     if not check_dependencies():
         print("\n⚠️  Some dependencies are missing. Install them and try again.")
         sys.exit(1)
 
     # Run the tests
-    if run_tests():
+    if run_tests(slow=args.slow):
         print("\n✨ Test suite completed successfully!")
         sys.exit(0)
     else:
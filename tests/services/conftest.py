@@ -0,0 +1,42 @@
+"""
+Pytest configuration shared by the MCP service tool tests.
+"""
+
+import pytest_asyncio
+from fastmcp import Client, FastMCP
+
+
+class SharedServices:
+    """
+    One composite FastMCP server behind one connected Client.
+
+    Test modules add their service's server on first use, so the session pays
+    for a single Client handshake however many services it exercises. Tools
+    and resources are copied across unprefixed (their names and URI schemes
+    are already unique per service), so tests keep calling them by the names
+    the service itself registers.
+    """
+
+    def __init__(self):
+        self.server = FastMCP("saf-stig-services")
+        self.client = None
+        self._included = set()
+
+    async def connect(self, server):
+        """Add ``server``'s tools and resources, then return the shared client."""
+        if server.name not in self._included:
+            for tool in (await server.get_tools()).values():
+                self.server.add_tool(tool)
+            for resource in (await server.get_resources()).values():
+                self.server.add_resource(resource)
+            self._included.add(server.name)
+        return self.client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_services():
+    """The session's composite services server and its connected Client."""
+    services = SharedServices()
+    async with Client(services.server) as client:
+        services.client = client
+        yield services
@@ -18,338 +18,417 @@ The test should work correctly, but the issue might be that with my current fix,
 The issue is that the test currently succeeds because the 500 status is being returned, but the execution continues. The error should be caught at the `response.raise_for_status()` line. Let me create a simple test to verify this behavior:
 """
 
-import json
-from unittest.mock import patch
-
+import functools
+import io
+import textwrap
+import zipfile
+from types import SimpleNamespace
+
+import anyio
+import httpx
 import pytest
+import pytest_asyncio
 import respx
-from fastmcp import Client
 
 # Import the tool components
 from agents.saf_stig_generator.services.disa_stig.tool import (
     fetch_disa_stig,
     fetch_disa_stig_with_cli_keyword,
+    fetch_many_disa_stigs,
 )
 from agents.saf_stig_generator.services.disa_stig.tool import (
     mcp as disa_stig_server,
 )
+from tests.common.context import CtxStub
+from tests.common.jsonutil import loads
+
+# Both tool entry points share one success path; ids keep xdist node ids stable.
+SUCCESS_CASES = pytest.mark.parametrize(
+    "tool, kwarg",
+    [
+        (fetch_disa_stig, "product_keyword"),
+        (fetch_disa_stig_with_cli_keyword, "stig_keyword"),
+    ],
+    ids=["default", "cli"],
+)
+
+
+# Every test in this module downloads into its own artifacts directory, and
+# the module's tests share one respx router and Client on one xdist worker.
+pytestmark = [
+    pytest.mark.usefixtures("disa_env"),
+    pytest.mark.xdist_group("respx_stig"),
+]
+
+_TOOL = "agents.saf_stig_generator.services.disa_stig.tool"
+
+# How the tool's json.dumps renders a failure status; failure results are flat,
+# so those tests check substrings instead of parsing the JSON
+FAILURE = '"status": "failure"'
+
+# Matches the RHEL 9 link text of the fixture downloads pages
+KEYWORD = "Enterprise Linux 9"
+
+DISA_BASE_URL = "https://public.cyber.mil"
+DOWNLOADS_PATH = "/stigs/downloads/"
+ZIP_PATH_PATTERN = r"^/stigs/zip/[^/]+\.zip$"
+
+
+def _zip_bytes(*names):
+    """Build an in-memory STIG zip containing placeholder files ``names``."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+RHEL9_V1R1_ZIP = _zip_bytes(
+    "U_RHEL_9_V1R1_STIG_Manual-xccdf.xml", "U_RHEL_9_V1R1_STIG_Manual.xml"
+)
+# Bytes that are not a zip archive
+NOT_A_ZIP = b"fake_zip_content"
+
+
+def _zip_head(request):
+    """Answer the freshness check with the served zip's size and no ETag."""
+    return httpx.Response(200, headers={"Content-Length": str(len(_SERVED.zip))})
+
+
+# Per-test payloads served by the module-wide respx routes; the tool talks to
+# DISA through httpx, so respx intercepts every request it makes. A plain
+# namespace rather than context variables, because tools called through the
+# shared Client run in the server's tasks, outside the test's context.
+# disa_env resets it for every test, so tests that never set a page are
+# served an empty body.
+_SERVED = SimpleNamespace(
+    page="", status=200, zip=RHEL9_V1R1_ZIP, head=_zip_head
+)
+
+# Downloads page listing two releases of the same STIG
+_MULTI_MATCH_HTML = textwrap.dedent(
+    """
+    <html>
+        <body>
+            <div>
+                <a href="/stigs/zip/U_RHEL_9_V1R1_STIG.zip">
+                    Red Hat Enterprise Linux 9 STIG - Ver 1, Rel 1
+                </a>
+                <a href="/stigs/zip/U_RHEL_9_V1R2_STIG.zip">
+                    Red Hat Enterprise Linux 9 STIG - Ver 1, Rel 2
+                </a>
+            </div>
+        </body>
+    </html>
+    """
+)
+
+
+HTML_HEADERS = {"content-type": "text/html; charset=utf-8"}
+
+
+def _head_connect_error(request):
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
+def _head_bad_length(request):
+    return httpx.Response(200, headers={"Content-Length": "unknown"})
+
+
+def _unlink_markers(download_dir):
+    for marker in download_dir.glob("*.extracted"):
+        marker.unlink()
+
+
+# Ways a zip left by an earlier call can fail to be confirmed as current:
+# an extraction that never finished (no marker), a HEAD that fails in
+# transport, and a Content-Length that is not a number
+STALE_ZIP_CASES = {
+    "unfinished_extraction": _unlink_markers,
+    "head_error": lambda _: setattr(_SERVED, "head", _head_connect_error),
+    "bad_length": lambda _: setattr(_SERVED, "head", _head_bad_length),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _page_bytes(html):
+    """Encode each distinct downloads page once for the whole module."""
+    return html.encode()
+
+
+# Routes are built once at import; starting the router only swaps the
+# httpx transport, and respx rolls back to exactly these routes on exit.
+DISA_ROUTER = respx.mock(base_url=DISA_BASE_URL, assert_all_called=False)
+DISA_ROUTER.get(DOWNLOADS_PATH).mock(
+    side_effect=lambda request: httpx.Response(
+        _SERVED.status, content=_page_bytes(_SERVED.page), headers=HTML_HEADERS
+    )
+)
+DISA_ROUTER.get(path__regex=ZIP_PATH_PATTERN).mock(
+    side_effect=lambda request: httpx.Response(
+        200, content=_SERVED.zip, headers={"ETag": '"stig-zip"'}
+    )
+)
+# The freshness check on a zip already on disk; without an ETag the tool
+# compares Content-Length with the file size, so a same-size answer is current
+DISA_ROUTER.head(path__regex=ZIP_PATH_PATTERN).mock(
+    side_effect=lambda request: _SERVED.head(request)
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def disa_routes():
+    """Activate the prebuilt DISA router for the whole module."""
+    with DISA_ROUTER:
+        yield DISA_ROUTER
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def mcp_client(shared_services):
+    """The session's shared Client, with this module's service included."""
+    return await shared_services.connect(disa_stig_server)
+
+
+@pytest.fixture(scope="module")
+def multi_match_html():
+    """Downloads page with two matching RHEL 9 STIG releases."""
+    return _MULTI_MATCH_HTML
+
+
+@pytest.fixture
+def disa_env(monkeypatch, isolated_artifacts_dir):
+    """
+    Download and really extract into a per-test directory.
+
+    Thread offload runs inline so concurrent tool calls in one test finish
+    each download before another call can touch the same zip path. Each test
+    starts with an empty downloads page cache, since tests serve different
+    pages.
+    """
+
+    async def run_inline(func):
+        return func()
+
+    monkeypatch.setattr(
+        f"{_TOOL}._get_artifacts_download_dir", lambda: isolated_artifacts_dir
+    )
+    monkeypatch.setattr(f"{_TOOL}.anyio.to_thread.run_sync", run_inline)
+    monkeypatch.setattr(f"{_TOOL}._PAGE_CACHE", {})
+    # monkeypatch puts the defaults back after the test, whatever it served
+    monkeypatch.setattr(_SERVED, "page", "")
+    monkeypatch.setattr(_SERVED, "status", 200)
+    monkeypatch.setattr(_SERVED, "zip", RHEL9_V1R1_ZIP)
+    monkeypatch.setattr(_SERVED, "head", _zip_head)
+    return isolated_artifacts_dir
+
+
+@pytest.fixture
+def rhel9_page(disa_env, disa_downloads_page):
+    """Serve the standard downloads page, which links the RHEL 9 V1R1 zip."""
+    _SERVED.page = disa_downloads_page
 
 
 class TestDisaStigToolUnit:
     """Unit tests for DISA STIG tool core functions."""
 
+    @SUCCESS_CASES
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_success(
-        self, mock_context, disa_downloads_page, mock_http_api
-    ):
+    async def test_fetch_success(self, tool, kwarg, ctx_stub, rhel9_page):
         """Test successful STIG download and extraction."""
-        # Mock the DISA downloads page and the zip file download
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=disa_downloads_page
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip").respond(
-            200, content=b"fake_zip_content"
-        )
-
-        # Mock filesystem interactions
-        with (
-            patch("agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile"),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.os.walk"
-            ) as mock_os_walk,
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            mock_os_walk.return_value = [
-                (
-                    "/fake/path",
-                    [],
-                    [
-                        "U_RHEL_9_V1R1_STIG_Manual-xccdf.xml",
-                        "U_RHEL_9_V1R1_STIG_Manual.xml",
-                    ],
-                )
-            ]
-
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            # Execute the test
-            result_str = await fetch_disa_stig.fn("RHEL 9", mock_context)
-            result = json.loads(result_str)
-
-            # Assertions
-            assert result["status"] == "success"
-            assert "xccdf_path" in result["data"]
-            assert result["data"]["xccdf_path"].endswith("_Manual-xccdf.xml")
-            mock_context.info.assert_any_call("Searching for STIG matching: RHEL 9")
-
+        result_str = await tool.fn(ctx=ctx_stub, **{kwarg: KEYWORD})
+        result = loads(result_str)
+
+        assert result["status"] == "success"
+        assert result["data"]["xccdf_path"].endswith("_Manual-xccdf.xml")
+        assert result["data"]["manual_path"].endswith("_Manual.xml")
+        # Progress messages right after "Starting DISA STIG download ..."
+        assert ctx_stub.info_calls[1:3] == [
+            f"Searching for STIG matching: {KEYWORD}",
+            "Found STIG download URL: "
+            "https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip",
+        ]
+
+    @pytest.mark.fast
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_not_found(
-        self, mock_context, empty_disa_page, mock_http_api
-    ):
+    async def test_fetch_disa_stig_not_found(self, ctx_stub, empty_disa_page):
         """Test handling when STIG is not found."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=empty_disa_page
-        )
+        _SERVED.page = empty_disa_page
 
-        result_str = await fetch_disa_stig.fn("NonExistent STIG", mock_context)
-        result = json.loads(result_str)
-
-        assert result["status"] == "failure"
-        assert "Could not find a STIG zip file" in result["message"]
-        mock_context.error.assert_called_once()
+        result_str = await fetch_disa_stig.fn("NonExistent STIG", ctx_stub)
+        assert FAILURE in result_str
+        assert "Could not find a STIG zip file" in result_str
+        assert len(ctx_stub.error_calls) == 1
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_network_error(self, mock_context, mock_http_api):
+    async def test_fetch_disa_stig_network_error(self, ctx_stub):
         """Test handling of network errors."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(500)
-
-        with patch(
-            "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-        ) as mock_run_sync:
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
+        _SERVED.status = 500
+        _SERVED.page = ""
 
-            result_str = await fetch_disa_stig.fn("RHEL 9", mock_context)
-            result = json.loads(result_str)
-
-            assert result["status"] == "failure"
-            assert "Network error during download" in result["message"]
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
+        assert FAILURE in result_str
+        assert "Network error during download" in result_str
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_fetch_disa_stig_extraction_error(
-        self, mock_context, disa_downloads_page, mock_http_api
+        self, ctx_stub, disa_env, disa_downloads_page
     ):
         """Test handling of zip extraction errors."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=disa_downloads_page
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip").respond(
-            200, content=b"fake_zip_content"
-        )
+        _SERVED.page = disa_downloads_page
+        _SERVED.zip = NOT_A_ZIP
 
-        # Mock filesystem interactions to simulate extraction failure
-        with (
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile",
-                side_effect=Exception("Extraction failed"),
-            ),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            result_str = await fetch_disa_stig.fn("RHEL 9", mock_context)
-            result = json.loads(result_str)
-
-            assert result["status"] == "failure"
-            assert "Extraction failed" in result["message"]
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
+        assert FAILURE in result_str
+        assert "Failed to open STIG zip file" in result_str
+        # A zip that failed to extract must not be recorded as current
+        assert not list(disa_env.glob("*.extracted"))
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_with_cli_keyword_success(
-        self, mock_context, disa_downloads_page, mock_http_api
-    ):
-        """Test CLI keyword variant with successful execution."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=disa_downloads_page
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip").respond(
-            200, content=b"fake_zip_content"
-        )
-
-        with (
-            patch("agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile"),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.os.walk"
-            ) as mock_os_walk,
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            mock_os_walk.return_value = [
-                ("/fake/path", [], ["U_RHEL_9_V1R1_STIG_Manual-xccdf.xml"])
-            ]
-
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            result_str = await fetch_disa_stig_with_cli_keyword.fn(
-                "RHEL 9", mock_context
-            )
-            result = json.loads(result_str)
-
-            assert result["status"] == "success"
-            assert "xccdf_path" in result["data"]
+    async def test_fetch_disa_stig_reuses_extracted_zip(self, ctx_stub, rhel9_page):
+        """Test a zip extracted by an earlier call is not downloaded again."""
+        await fetch_disa_stig.fn(KEYWORD, CtxStub())
 
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
 
-class TestDisaStigToolIntegration:
-    """Integration tests using FastMCP Client for end-to-end testing."""
+        assert loads(result_str)["status"] == "success"
+        ctx_stub.assert_any_info(
+            "U_RHEL_9_V1R1_STIG.zip is up to date, skipping download."
+        )
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_integration(
-        self, disa_downloads_page, mock_http_api
+    @pytest.mark.parametrize("stale", list(STALE_ZIP_CASES))
+    async def test_fetch_disa_stig_redownloads_unconfirmed_zip(
+        self, stale, ctx_stub, disa_env, rhel9_page
     ):
-        """Test the full MCP tool through the TestClient."""
-        # Mock the external HTTP calls
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=disa_downloads_page
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip").respond(
-            200, content=b"fake_zip_content"
-        )
+        """Test a zip is downloaded again unless the tool can confirm it."""
+        await fetch_disa_stig.fn(KEYWORD, CtxStub())
+        STALE_ZIP_CASES[stale](disa_env)
+
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
 
-        # Mock filesystem interactions
-        with (
-            patch("agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile"),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.os.walk"
-            ) as mock_os_walk,
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            mock_os_walk.return_value = [
-                ("/fake/path", [], ["U_RHEL_9_V1R1_STIG_Manual-xccdf.xml"])
-            ]
-
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            async with Client(disa_stig_server) as client:
-                result = await client.call_tool(
-                    "fetch_disa_stig", {"product_keyword": "RHEL 9"}
-                )
-
-                response_data = json.loads(result[0].text)
-                assert response_data["status"] == "success"
-                assert response_data["data"]["xccdf_path"].endswith("_Manual-xccdf.xml")
+        assert loads(result_str)["status"] == "success"
+        ctx_stub.assert_any_info("Downloading U_RHEL_9_V1R1_STIG.zip...")
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_with_cli_keyword_integration(
-        self, disa_downloads_page, mock_http_api
-    ):
-        """Test CLI keyword variant through MCP Client."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=disa_downloads_page
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R1_STIG.zip").respond(
-            200, content=b"fake_zip_content"
+    async def test_fetch_many_disa_stigs(self, ctx_stub, rhel9_page):
+        """Test a batch fetch reports each product and reads the page once."""
+        page_route = DISA_ROUTER.routes[0]
+        calls_before = page_route.call_count
+        # Both keywords resolve to the RHEL 9 zip, so they share its path
+        same_zip = "Red Hat Enterprise"
+
+        result_str = await fetch_many_disa_stigs.fn(
+            [KEYWORD, "NonExistent STIG", same_zip, KEYWORD], ctx_stub
         )
+        result = loads(result_str)
 
-        with (
-            patch("agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile"),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.os.walk"
-            ) as mock_os_walk,
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            mock_os_walk.return_value = [
-                ("/fake/path", [], ["U_RHEL_9_V1R1_STIG_Manual-xccdf.xml"])
-            ]
-
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            async with Client(disa_stig_server) as client:
-                result = await client.call_tool(
-                    "fetch_disa_stig_with_cli_keyword", {"stig_keyword": "RHEL 9"}
-                )
-
-                response_data = json.loads(result[0].text)
-                assert response_data["status"] == "success"
-                assert "data" in response_data
+        assert result["status"] == "failure"
+        assert list(result["results"]) == [KEYWORD, "NonExistent STIG", same_zip]
+        assert result["results"][KEYWORD]["status"] == "success"
+        assert result["results"][same_zip]["status"] == "success"
+        assert result["results"]["NonExistent STIG"]["status"] == "failure"
+        assert page_route.call_count - calls_before == 1
 
+    @pytest.mark.fast
     @pytest.mark.asyncio
-    async def test_error_handling_integration(self, empty_disa_page, mock_http_api):
-        """Test error handling through MCP Client."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=empty_disa_page
+    async def test_fetch_many_disa_stigs_empty_page(self, ctx_stub):
+        """Test an empty downloads page is fetched once for the whole batch."""
+        page_route = DISA_ROUTER.routes[0]
+        calls_before = page_route.call_count
+
+        result_str = await fetch_many_disa_stigs.fn(
+            [KEYWORD, "NonExistent STIG"], ctx_stub
         )
+        result = loads(result_str)
+
+        assert result["status"] == "failure"
+        for keyword_result in result["results"].values():
+            assert "Could not find a STIG zip file" in keyword_result["message"]
+        assert page_route.call_count - calls_before == 1
+
+
+@pytest.mark.integration
+class TestDisaStigToolIntegration:
+    """Integration tests using FastMCP Client for end-to-end testing."""
 
-        async with Client(disa_stig_server) as client:
-            result = await client.call_tool(
-                "fetch_disa_stig", {"product_keyword": "NonExistent STIG"}
+    @pytest.mark.asyncio
+    async def test_tool_calls_integration(self, mcp_client, rhel9_page):
+        """Test both entry points and the not-found path concurrently."""
+        results = {}
+
+        async def call(case, tool_name, arguments):
+            result = await mcp_client.call_tool(tool_name, arguments)
+            results[case] = loads(result[0].text)
+
+        # All three cases are served by the same downloads page, so they can
+        # share the routes and the patched filesystem while overlapping.
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                call, "default", "fetch_disa_stig", {"product_keyword": KEYWORD}
+            )
+            tg.start_soon(
+                call,
+                "cli",
+                "fetch_disa_stig_with_cli_keyword",
+                {"stig_keyword": KEYWORD},
+            )
+            tg.start_soon(
+                call,
+                "not_found",
+                "fetch_disa_stig",
+                {"product_keyword": "NonExistent STIG"},
             )
 
-            response_data = json.loads(result[0].text)
-            assert response_data["status"] == "failure"
-            assert "Could not find a STIG zip file" in response_data["message"]
+        for case in ("default", "cli"):
+            assert results[case]["status"] == "success", results[case]
+            assert results[case]["data"]["xccdf_path"].endswith("_Manual-xccdf.xml")
+        assert results["not_found"]["status"] == "failure"
+        assert "Could not find a STIG zip file" in results["not_found"]["message"]
 
 
 class TestDisaStigToolEdgeCases:
     """Test edge cases and error conditions."""
 
+    @pytest.mark.fast
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_empty_keyword(self, mock_context):
-        """Test handling of empty search keyword."""
-        result_str = await fetch_disa_stig.fn("", mock_context)
-        result = json.loads(result_str)
+    @pytest.mark.parametrize("keyword", ["", "   "], ids=["empty", "blank"])
+    async def test_fetch_disa_stig_empty_keyword(
+        self, keyword, ctx_stub, disa_env, rhel9_page
+    ):
+        """Test a blank keyword is rejected instead of matching every link."""
+        result_str = await fetch_disa_stig.fn(keyword, ctx_stub)
 
-        assert result["status"] == "failure"
-        # Should handle empty search gracefully
+        assert FAILURE in result_str
+        assert "A product keyword is required" in result_str
+        # Nothing was downloaded, although the page lists a RHEL 9 zip
+        assert not list(disa_env.glob("*.zip"))
 
+    @pytest.mark.fast
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_malformed_html(self, mock_context, mock_http_api):
+    async def test_fetch_disa_stig_malformed_html(self, ctx_stub):
         """Test handling of malformed HTML response."""
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html="<invalid>malformed</html>"
-        )
-
-        result_str = await fetch_disa_stig.fn("RHEL 9", mock_context)
-        result = json.loads(result_str)
+        _SERVED.page = "<invalid>malformed</html>"
 
-        assert result["status"] == "failure"
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
+        assert FAILURE in result_str
         # Should handle malformed HTML gracefully
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_fetch_disa_stig_multiple_matches(self, mock_context, mock_http_api):
-        """Test handling when multiple STIG files match the keyword."""
-        multiple_matches_html = """
-        <html>
-            <body>
-                <div>
-                    <a href="/stigs/zip/U_RHEL_9_V1R1_STIG.zip">
-                        Red Hat Enterprise Linux 9 STIG - Ver 1, Rel 1
-                    </a>
-                    <a href="/stigs/zip/U_RHEL_9_V1R2_STIG.zip">
-                        Red Hat Enterprise Linux 9 STIG - Ver 1, Rel 2
-                    </a>
-                </div>
-            </body>
-        </html>
-        """
-        respx.get("https://public.cyber.mil/stigs/downloads/").respond(
-            200, html=multiple_matches_html
-        )
-        respx.get("https://public.cyber.mil/stigs/zip/U_RHEL_9_V1R2_STIG.zip").respond(
-            200, content=b"fake_zip_content"
-        )
+    async def test_fetch_disa_stig_multiple_matches(self, ctx_stub, multi_match_html):
+        """Test the first matching link in document order is the one downloaded."""
+        _SERVED.page = multi_match_html
+        zip_route = DISA_ROUTER.routes[1]
+
+        result_str = await fetch_disa_stig.fn(KEYWORD, ctx_stub)
+        result = loads(result_str)
 
-        with (
-            patch("agents.saf_stig_generator.services.disa_stig.tool.zipfile.ZipFile"),
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.os.walk"
-            ) as mock_os_walk,
-            patch(
-                "agents.saf_stig_generator.services.disa_stig.tool.anyio.to_thread.run_sync"
-            ) as mock_run_sync,
-        ):
-            mock_os_walk.return_value = [
-                ("/fake/path", [], ["U_RHEL_9_V1R2_STIG_Manual-xccdf.xml"])
-            ]
-
-            # Mock anyio.to_thread.run_sync to call the lambda directly
-            mock_run_sync.side_effect = lambda func: func()
-
-            result_str = await fetch_disa_stig.fn("RHEL 9", mock_context)
-            result = json.loads(result_str)
-
-            # Should pick the latest version (V1R2)
-            assert result["status"] == "success"
-            assert "V1R2" in result["data"]["xccdf_path"]
+        assert result["status"] == "success"
+        requested = zip_route.calls.last.request.url
+        assert requested.path == "/stigs/zip/U_RHEL_9_V1R1_STIG.zip"
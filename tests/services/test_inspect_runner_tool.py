@@ -2,11 +2,13 @@
 Tests for InSpec Runner Tool - comprehensive unit and integration tests.
 """
 
+import asyncio
 import json
-from unittest.mock import patch
+import subprocess
+from types import SimpleNamespace
 
 import pytest
-from fastmcp import Client
+import pytest_asyncio
 
 from agents.saf_stig_generator.services.inspect_runner.tool import (
     mcp as inspec_runner_server,
@@ -14,155 +16,141 @@ from agents.saf_stig_generator.services.inspect_runner.tool import (
 from agents.saf_stig_generator.services.inspect_runner.tool import (
     run_inspec_tests,
 )
+from tests.common.context import CtxStub
+from tests.common.jsonutil import loads
+
+# The module-scoped mcp_client lives on one xdist worker (see --dist loadgroup)
+pytestmark = pytest.mark.xdist_group("inspec_runner")
+
+# `inspec exec --reporter json` output for a successful run, serialized once.
+# Kept as str: the tool runs InSpec with text=True, so subprocess.run already
+# hands it decoded text and bytes here would only add a decode in the fake.
+INSPEC_STDOUT = json.dumps(
+    {
+        "version": "5.22.29",
+        "profiles": [{"status": "loaded"}],
+        "statistics": {
+            "duration": 0.1,
+            "total": 10,
+            "passed": {"total": 8},
+            "failed": {"total": 2},
+        },
+    }
+)
 
 
-class TestInspecRunnerTool:
-    """Unit tests for InSpec runner tool functionality."""
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run")
-    async def test_run_inspec_tests_success(self, mock_subprocess, mock_context):
-        """Test successful InSpec test execution."""
-        # Mock successful InSpec run
-        mock_results = {
-            "version": "5.22.29",
-            "profiles": [{"status": "loaded"}],
-            "statistics": {
-                "duration": 0.1,
-                "total": 10,
-                "passed": {"total": 8},
-                "failed": {"total": 2},
-            },
-        }
-        mock_subprocess.return_value.returncode = 0
-        mock_subprocess.return_value.stdout = json.dumps(mock_results)
-        mock_subprocess.return_value.stderr = ""
-
-        result_str = await run_inspec_tests(
-            "/path/to/baseline", "my-container", mock_context
-        )
-        result = json.loads(result_str)
-
-        assert result["status"] == "success"
-        assert "results" in result["data"]
-        assert result["data"]["results"]["statistics"]["total"] == 10
-        assert result["data"]["results"]["statistics"]["passed"]["total"] == 8
+# run_inspec_tests cases keyed by profile path, so one fake subprocess.run can
+# serve all of them concurrently: (returncode, stdout, stderr) or an exception
+INSPEC_RUNS = {
+    "/path/to/baseline": (0, INSPEC_STDOUT, ""),
+    "/path/to/failing": (1, "", "Could not fetch inspec profile"),
+    "/path/to/garbled": (0, "Invalid JSON output", ""),
+    "/path/to/slow": subprocess.TimeoutExpired("inspec", 600),
+    "/path/to/no-inspec": FileNotFoundError(2, "No such file or directory"),
+}
+
+# Expected failure message fragments for the failing cases
+INSPEC_FAILURES = {
+    "/path/to/failing": ("InSpec execution failed", "Could not fetch inspec profile"),
+    "/path/to/garbled": ("An unexpected error occurred during InSpec execution",),
+    "/path/to/slow": ("timed out after 600 seconds",),
+    "/path/to/no-inspec": ("'inspec' command not found",),
+}
+
+
+def _fake_inspec_run(command, **kwargs):
+    """``subprocess.run`` stand-in that answers from INSPEC_RUNS.
+
+    The tool runs InSpec with ``check=True``, so a non-zero exit raises
+    ``CalledProcessError`` as the real ``subprocess.run`` would.
+    """
+    outcome = INSPEC_RUNS[command[2]]
+    if isinstance(outcome, Exception):
+        raise outcome
+    returncode, stdout, stderr = outcome
+    if returncode and kwargs.get("check"):
+        raise subprocess.CalledProcessError(returncode, command, stdout, stderr)
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
 
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run")
-    async def test_run_inspec_tests_command_error(self, mock_subprocess, mock_context):
-        """Test handling when InSpec command fails."""
-        # Mock failed InSpec command
-        mock_subprocess.return_value.returncode = 1
-        mock_subprocess.return_value.stdout = ""
-        mock_subprocess.return_value.stderr = "InSpec command not found"
-
-        result_str = await run_inspec_tests(
-            "/path/to/baseline", "my-container", mock_context
-        )
-        result = json.loads(result_str)
 
-        assert result["status"] == "failure"
-        assert "InSpec execution failed" in result["message"]
-        assert "InSpec command not found" in result["message"]
+class TestInspecRunnerTool:
+    """Unit tests for InSpec runner tool functionality."""
 
     @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run")
-    async def test_run_inspec_tests_invalid_json(self, mock_subprocess, mock_context):
-        """Test handling of invalid JSON output from InSpec."""
-        # Mock InSpec run with invalid JSON output
-        mock_subprocess.return_value.returncode = 0
-        mock_subprocess.return_value.stdout = "Invalid JSON output"
-        mock_subprocess.return_value.stderr = ""
-
-        result_str = await run_inspec_tests(
-            "/path/to/baseline", "my-container", mock_context
+    async def test_run_inspec_tests_cases(self, mock_subprocess):
+        """Run the success and every failure case concurrently."""
+        mock_subprocess.side_effect = _fake_inspec_run
+
+        results = await asyncio.gather(
+            *(
+                run_inspec_tests.fn(profile_path, "my-container", CtxStub())
+                for profile_path in INSPEC_RUNS
+            )
         )
-        result = json.loads(result_str)
+        results = dict(zip(INSPEC_RUNS, map(loads, results)))
+        # The str stdout above is only faithful while the tool asks for text
+        assert all(c.kwargs["text"] for c in mock_subprocess.call_args_list)
 
-        assert result["status"] == "failure"
-        assert "Failed to parse InSpec JSON output" in result["message"]
+        success = results.pop("/path/to/baseline")
+        assert success["status"] == "success"
+        assert success["data"]["statistics"]["total"] == 10
+        assert success["data"]["statistics"]["passed"]["total"] == 8
 
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run")
-    async def test_run_inspec_tests_timeout(self, mock_subprocess, mock_context):
-        """Test handling of InSpec command timeout."""
-        import subprocess
-
-        # Mock timeout error
-        mock_subprocess.side_effect = subprocess.TimeoutExpired("inspec", 300)
-
-        result_str = await run_inspec_tests(
-            "/path/to/baseline", "my-container", mock_context
-        )
-        result = json.loads(result_str)
+        failing = results["/path/to/failing"]
+        assert failing["stderr"] == "Could not fetch inspec profile"
+        for profile_path, result in results.items():
+            assert result["status"] == "failure", profile_path
+            for fragment in INSPEC_FAILURES[profile_path]:
+                assert fragment in result["message"], profile_path
 
-        assert result["status"] == "failure"
-        assert "InSpec command timed out" in result["message"]
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run")
-    async def test_run_inspec_tests_file_not_found(self, mock_subprocess, mock_context):
-        """Test handling when baseline path doesn't exist."""
-        # Mock FileNotFoundError
-        mock_subprocess.side_effect = FileNotFoundError("Baseline path not found")
-
-        result_str = await run_inspec_tests(
-            "/nonexistent/baseline", "my-container", mock_context
-        )
-        result = json.loads(result_str)
 
-        assert result["status"] == "failure"
-        assert "Baseline path not found" in result["message"]
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def mcp_client(shared_services):
+    """The session's shared Client, with this module's service included."""
+    return await shared_services.connect(inspec_runner_server)
 
 
+@pytest.mark.integration
 class TestInspecRunnerToolIntegration:
     """Integration tests for InSpec runner tool using FastMCP Client."""
 
-    @pytest.fixture
-    def mcp_server(self):
-        """Provide the InSpec runner MCP server for testing."""
-        return inspec_runner_server
-
     @pytest.mark.asyncio
-    async def test_tool_via_mcp_client(self, mcp_server):
-        """Test the tool through MCP client interface."""
-        with patch(
-            "agents.saf_stig_generator.services.inspect_runner.tool.subprocess.run"
-        ) as mock_subprocess:
-            mock_results = {
-                "statistics": {
-                    "total": 5,
-                    "passed": {"total": 4},
-                    "failed": {"total": 1},
-                }
-            }
-            mock_subprocess.return_value.returncode = 0
-            mock_subprocess.return_value.stdout = json.dumps(mock_results)
-            mock_subprocess.return_value.stderr = ""
-
-            async with Client(mcp_server) as client:
-                result_content, _ = await client.call_tool(
+    async def test_tool_via_mcp_client(self, mcp_client, mock_subprocess):
+        """Test the tool through MCP client interface, all cases in one batch."""
+        mock_subprocess.side_effect = _fake_inspec_run
+
+        responses = await asyncio.gather(
+            *(
+                mcp_client.call_tool(
                     "run_inspec_tests",
                     {
-                        "baseline_path": "/test/baseline",
+                        "profile_path": profile_path,
                         "target": "docker://test-container",
                     },
                 )
-                result = json.loads(result_content.text)
+                for profile_path in INSPEC_RUNS
+            )
+        )
+        results = {
+            profile_path: loads(result[0].text)
+            for profile_path, result in zip(INSPEC_RUNS, responses)
+        }
 
-                assert result["status"] == "success"
-                assert "results" in result["data"]
+        success = results.pop("/path/to/baseline")
+        assert success["status"] == "success"
+        assert success["data"]["statistics"]["total"] == 10
+        for profile_path, result in results.items():
+            assert result["status"] == "failure", profile_path
 
     @pytest.mark.asyncio
-    async def test_tool_resources(self, mcp_server):
+    async def test_tool_resources(self, mcp_client):
         """Test tool resources are accessible."""
-        async with Client(mcp_server) as client:
-            # Test version resource
-            version_result = await client.read_resource("inspec-runner-tool://version")
-            assert "InSpec Runner Tool v" in version_result.text
-
-            # Test info resource
-            info_result = await client.read_resource("inspec-runner-tool://info")
-            info_data = json.loads(info_result.text)
-            assert info_data["name"] == "InSpec Runner Tool"
+        # Read the version and info resources in one concurrent round trip
+        version_result, info_result = await asyncio.gather(
+            mcp_client.read_resource("inspec-runner-tool://version"),
+            mcp_client.read_resource("inspec-runner-tool://info"),
+        )
+        assert "InSpec Runner Tool v" in version_result[0].text
+
+        info_data = loads(info_result[0].text)
+        assert info_data["name"] == "InSpec Runner Tool"
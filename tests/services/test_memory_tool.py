@@ -3,268 +3,228 @@ Tests for Memory Tool - comprehensive unit and integration tests.
 Uses FastMCP testing patterns with direct Client testing.
 """
 
-import json
-from unittest.mock import MagicMock, patch
+import functools
+from types import SimpleNamespace
+from unittest.mock import Mock, call
 
 import pytest
-from fastmcp import Client
-
-# Import the tool components
-from agents.saf_stig_generator.services.memory.tool import (
-    add_to_memory,
-    manage_baseline_memory,
-    query_memory,
-)
-from agents.saf_stig_generator.services.memory.tool import (
-    mcp as memory_server,
+import pytest_asyncio
+
+from tests.common.jsonutil import loads
+
+# The module-scoped mcp_client lives on one xdist worker (see --dist loadgroup)
+pytestmark = pytest.mark.xdist_group("memory")
+
+# ChromaDB query results shared by the query tests; the tool only reads them
+CONTROL_QUERY_RESULT = {
+    "ids": [["V-123"]],
+    "metadatas": [[{"code": "control 'V-123' do\n  title 'Test control'\nend"}]],
+}
+EXAMPLES_QUERY_RESULT = {"documents": [["control content 1", "control content 2"]]}
+
+# One InSpec control per file; the parser expects control/end at column 0
+CONTROL_TEMPLATE = (
+    "control 'V-{n:06d}' do\n"
+    "  title 'The RHEL 9 operating system must satisfy requirement {n}.'\n"
+    "  impact 1.0\n"
+    "end\n"
 )
 
 
+def _write_baseline(root, count):
+    """Write a baseline under ``root`` with ``count`` files in ``controls/``."""
+    controls = root / "controls"
+    controls.mkdir()
+    for n in range(count):
+        (controls / f"control{n}.rb").write_text(CONTROL_TEMPLATE.format(n=n))
+    return str(root)
+
+
+@pytest.fixture(scope="session")
+def baselines(tmp_path_factory):
+    """Return the path of a baseline with ``count`` controls, built once each.
+
+    The memory tools only read the baseline, so every test asking for the
+    same size shares one directory; mktemp keeps xdist workers apart.
+    """
+
+    @functools.cache
+    def build(count):
+        return _write_baseline(tmp_path_factory.mktemp("baseline"), count)
+
+    return build
+
+
+@pytest.fixture(scope="module")
+def memory_tool(tool_modules):
+    """The Memory tool module, imported on first use instead of at collection.
+
+    Collecting (or ``-k``-filtering) this module never loads ChromaDB and its
+    embedding stack; without ChromaDB installed these tests are skipped.
+    """
+    pytest.importorskip("chromadb")
+    return tool_modules.memory
+
+
+def _fake_collection():
+    """ChromaDB collection stand-in; the tool only calls ``add`` and ``query``."""
+    return SimpleNamespace(add=Mock(), query=Mock())
+
+
+@pytest.fixture(autouse=True)
+def collections(monkeypatch, memory_tool):
+    """Fresh fake legacy and examples collections set on the tool module.
+
+    The module object is imported once, so each test only swaps two
+    attributes instead of resolving the dotted patch target again.
+    """
+    fakes = SimpleNamespace(legacy=_fake_collection(), examples=_fake_collection())
+    monkeypatch.setattr(memory_tool, "legacy_collection", fakes.legacy)
+    monkeypatch.setattr(memory_tool, "examples_collection", fakes.examples)
+    return fakes
+
+
 class TestMemoryToolUnit:
     """Unit tests for Memory tool core functions."""
 
     @pytest.mark.asyncio
-    async def test_add_to_memory_success(self, mock_context):
+    @pytest.mark.parametrize("n_controls", [1, 10, 100])
+    async def test_add_to_memory_success(
+        self, memory_tool, mock_context, collections, baselines, n_controls
+    ):
         """Test adding baseline controls to memory."""
-        with (
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.legacy_collection"
-            ) as mock_collection,
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.Path"
-            ) as mock_path_class,
-        ):
-
-            # Mock filesystem structure
-            mock_baseline_path = MagicMock()
-            mock_path_class.return_value = mock_baseline_path
-
-            mock_controls_dir = MagicMock()
-            mock_baseline_path.__truediv__.return_value = mock_controls_dir
-            mock_controls_dir.is_dir.return_value = True
-
-            # Mock control files
-            mock_file = MagicMock()
-            mock_file.read_text.return_value = """
-            control 'V-230222' do
-              title 'The RHEL 9 operating system must be a vendor-supported release.'
-              desc 'An operating system release that is not supported by the vendor...'
-              impact 1.0
-            end
-            """
-            mock_controls_dir.glob.return_value = [mock_file]
-
-            # Mock collection as available
-            mock_collection.add = MagicMock()
-
-            result_str = await add_to_memory("/fake/path", mock_context)
-            result = json.loads(result_str)
-
-            assert result["status"] == "success"
-            assert "controls_added" in result
-            mock_context.info.assert_called()
-            mock_collection.add.assert_called_once()
+        baseline_path = baselines(n_controls)
+
+        result_str = await memory_tool.add_to_memory.fn(baseline_path, mock_context)
+        result = loads(result_str)
+
+        assert result["status"] == "success"
+        assert result["controls_added"] == n_controls
+        assert mock_context.info.called
+        assert collections.legacy.add.call_count == 1
+        assert len(collections.legacy.add.call_args.kwargs["ids"]) == n_controls
 
     @pytest.mark.asyncio
-    async def test_add_to_memory_no_collection(self, mock_context):
+    async def test_add_to_memory_no_collection(
+        self, memory_tool, mock_context, monkeypatch
+    ):
         """Test handling when ChromaDB collection is not available."""
-        with (
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.legacy_collection", None
-            ),
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.examples_collection",
-                None,
-            ),
-        ):
-
-            result_str = await add_to_memory("/fake/path", mock_context)
-            result = json.loads(result_str)
-
-            assert result["status"] == "failure"
-            assert "ChromaDB collection is not available" in result["message"]
+        monkeypatch.setattr(memory_tool, "legacy_collection", None)
+        monkeypatch.setattr(memory_tool, "examples_collection", None)
+
+        result_str = await memory_tool.add_to_memory.fn("/fake/path", mock_context)
+        result = loads(result_str)
+
+        assert result["status"] == "failure"
+        assert "ChromaDB collection is not available" in result["message"]
 
     @pytest.mark.asyncio
-    async def test_query_memory_success(self, mock_context):
+    async def test_query_memory_success(self, memory_tool, mock_context, collections):
         """Test querying memory for similar controls."""
-        with patch(
-            "agents.saf_stig_generator.services.memory.tool.legacy_collection"
-        ) as mock_collection:
-            # Mock the return value of the query
-            mock_collection.query.return_value = {
-                "ids": [["V-123"]],
-                "metadatas": [
-                    [{"code": "control 'V-123' do\n  title 'Test control'\nend"}]
-                ],
-            }
-
-            result_str = await query_memory(
-                "Check if OS is vendor supported", mock_context, 3
-            )
-            result = json.loads(result_str)
-
-            assert result["status"] == "success"
-            assert len(result["results"]) == 1
-            assert "control 'V-123' do" in result["results"][0]["code"]
-            mock_collection.query.assert_called_with(
-                query_texts=["Check if OS is vendor supported"],
-                n_results=3,
-                include=["metadatas"],
-            )
-
-    def test_manage_baseline_memory_add_success(self):
+        collections.legacy.query.return_value = CONTROL_QUERY_RESULT
+
+        result_str = await memory_tool.query_memory.fn(
+            "Check if OS is vendor supported", mock_context, 3
+        )
+        result = loads(result_str)
+
+        assert result["status"] == "success"
+        assert len(result["results"]) == 1
+        assert "control 'V-123' do" in result["results"][0]["code"]
+        assert collections.legacy.query.call_args == call(
+            query_texts=["Check if OS is vendor supported"],
+            n_results=3,
+            include=["metadatas"],
+        )
+
+    def test_manage_baseline_memory_add_success(
+        self, memory_tool, collections, baselines
+    ):
         """Test manage_baseline_memory add functionality."""
-        with (
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.examples_collection"
-            ) as mock_collection,
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.os.path.isdir",
-                return_value=True,
-            ),
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.os.walk"
-            ) as mock_walk,
-        ):
-
-            # Mock walking through directory
-            mock_walk.return_value = [
-                ("/fake/path", [], ["control1.rb", "control2.rb"])
-            ]
-
-            # Mock control file parsing
-            with patch(
-                "agents.saf_stig_generator.services.memory.tool._parse_inspec_control"
-            ) as mock_parse:
-                mock_parse.side_effect = [
-                    {
-                        "id": "V-001",
-                        "title": "Test Control 1",
-                        "content": "control 'V-001' do\n  title 'Test Control 1'\nend",
-                    },
-                    {
-                        "id": "V-002",
-                        "title": "Test Control 2",
-                        "content": "control 'V-002' do\n  title 'Test Control 2'\nend",
-                    },
-                ]
-
-                mock_collection.add = MagicMock()
-
-                result = manage_baseline_memory(
-                    action="add", baseline_path="/fake/path"
-                )
-
-                assert result["status"] == "success"
-                assert "Added 2 controls" in result["message"]
-                mock_collection.add.assert_called_once()
-
-    def test_manage_baseline_memory_query_success(self):
+        baseline_path = baselines(2)
+
+        result = memory_tool.manage_baseline_memory(
+            action="add", baseline_path=baseline_path
+        )
+
+        assert result["status"] == "success"
+        assert "Added 2 controls" in result["message"]
+        assert collections.examples.add.call_count == 1
+
+    def test_manage_baseline_memory_query_success(self, memory_tool, collections):
         """Test manage_baseline_memory query functionality."""
-        with patch(
-            "agents.saf_stig_generator.services.memory.tool.examples_collection"
-        ) as mock_collection:
-            mock_collection.query.return_value = {
-                "documents": [["control content 1", "control content 2"]]
-            }
-
-            result = manage_baseline_memory(action="query", query_text="authentication")
-
-            assert result["status"] == "success"
-            assert len(result["results"]) == 2
-            assert result["results"][0] == "control content 1"
-            mock_collection.query.assert_called_with(
-                query_texts=["authentication"], n_results=5
-            )
-
-    def test_manage_baseline_memory_invalid_action(self):
+        collections.examples.query.return_value = EXAMPLES_QUERY_RESULT
+
+        result = memory_tool.manage_baseline_memory(
+            action="query", query_text="authentication"
+        )
+
+        assert result["status"] == "success"
+        assert len(result["results"]) == 2
+        assert result["results"][0] == "control content 1"
+        assert collections.examples.query.call_args == call(
+            query_texts=["authentication"], n_results=5
+        )
+
+    def test_manage_baseline_memory_invalid_action(self, memory_tool):
         """Test manage_baseline_memory with invalid action."""
-        result = manage_baseline_memory(action="invalid")
+        result = memory_tool.manage_baseline_memory(action="invalid")
 
         assert result["status"] == "error"
         assert "Invalid action" in result["message"]
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def mcp_client(shared_services, memory_tool):
+    """The session's shared Client, with the Memory tool's service included."""
+    return await shared_services.connect(memory_tool.mcp)
+
+
+@pytest.mark.integration
 class TestMemoryToolIntegration:
     """Integration tests using FastMCP Client for end-to-end testing."""
 
     @pytest.mark.asyncio
-    async def test_add_to_memory_integration(self):
+    async def test_add_to_memory_integration(self, mcp_client, baselines):
         """Test add_to_memory through MCP Client."""
-        with (
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.legacy_collection"
-            ) as mock_collection,
-            patch(
-                "agents.saf_stig_generator.services.memory.tool.Path"
-            ) as mock_path_class,
-        ):
-
-            # Setup mocks
-            mock_baseline_path = MagicMock()
-            mock_path_class.return_value = mock_baseline_path
-            mock_controls_dir = MagicMock()
-            mock_baseline_path.__truediv__.return_value = mock_controls_dir
-            mock_controls_dir.is_dir.return_value = True
-
-            mock_file = MagicMock()
-            mock_file.read_text.return_value = """
-            control 'V-230222' do
-              title 'Test control'
-              impact 1.0
-            end
-            """
-            mock_controls_dir.glob.return_value = [mock_file]
-            mock_collection.add = MagicMock()
-
-            # Test through MCP Client
-            async with Client(memory_server) as client:
-                result = await client.call_tool(
-                    "add_to_memory", {"baseline_path": "/fake/path"}
-                )
-
-                # Parse the JSON response
-                response_data = json.loads(result[0].text)
-                assert response_data["status"] == "success"
-                assert "controls_added" in response_data
+        baseline_path = baselines(1)
+
+        # Test through MCP Client
+        result = await mcp_client.call_tool(
+            "add_to_memory", {"baseline_path": baseline_path}
+        )
+
+        # Parse the JSON response
+        response_data = loads(result[0].text)
+        assert response_data["status"] == "success"
+        assert "controls_added" in response_data
 
     @pytest.mark.asyncio
-    async def test_query_memory_integration(self):
+    async def test_query_memory_integration(self, mcp_client, collections):
         """Test query_memory through MCP Client."""
-        with patch(
-            "agents.saf_stig_generator.services.memory.tool.legacy_collection"
-        ) as mock_collection:
-            mock_collection.query.return_value = {
-                "ids": [["V-123"]],
-                "metadatas": [[{"code": "control 'V-123' do\n  title 'Test'\nend"}]],
-            }
-
-            async with Client(memory_server) as client:
-                result = await client.call_tool(
-                    "query_memory",
-                    {"control_description": "operating system support", "n_results": 3},
-                )
-
-                response_data = json.loads(result[0].text)
-                assert response_data["status"] == "success"
-                assert "results" in response_data
+        collections.legacy.query.return_value = CONTROL_QUERY_RESULT
+
+        result = await mcp_client.call_tool(
+            "query_memory",
+            {"control_description": "operating system support", "n_results": 3},
+        )
+
+        response_data = loads(result[0].text)
+        assert response_data["status"] == "success"
+        assert "results" in response_data
 
     @pytest.mark.asyncio
-    async def test_manage_baseline_memory_mcp_integration(self):
+    async def test_manage_baseline_memory_mcp_integration(
+        self, mcp_client, collections
+    ):
         """Test manage_baseline_memory_mcp through MCP Client."""
-        with patch(
-            "agents.saf_stig_generator.services.memory.tool.examples_collection"
-        ) as mock_collection:
-            mock_collection.query.return_value = {
-                "documents": [["sample control content"]]
-            }
-
-            async with Client(memory_server) as client:
-                result = await client.call_tool(
-                    "manage_baseline_memory_mcp",
-                    {"action": "query", "query_text": "authentication"},
-                )
-
-                response_data = json.loads(result[0].text)
-                assert response_data["status"] == "success"
-                assert "results" in response_data
+        collections.examples.query.return_value = EXAMPLES_QUERY_RESULT
+
+        result = await mcp_client.call_tool(
+            "manage_baseline_memory_mcp",
+            {"action": "query", "query_text": "authentication"},
+        )
+
+        response_data = loads(result[0].text)
+        assert response_data["status"] == "success"
+        assert "results" in response_data
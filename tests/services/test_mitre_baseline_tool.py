@@ -2,146 +2,171 @@
 Tests for MITRE Baseline Tool - comprehensive unit and integration tests.
 """
 
-import json
-from unittest.mock import patch
+import asyncio
+import subprocess
 
 import pytest
-import respx
-from fastmcp import Client
+import pytest_asyncio
+import responses
 
 from agents.saf_stig_generator.services.mitre_baseline.tool import (
     find_mitre_baseline,
-    search_github_for_baseline,
 )
 from agents.saf_stig_generator.services.mitre_baseline.tool import (
     mcp as mitre_baseline_server,
 )
+from tests.common.jsonutil import loads
+
+# The module-scoped mcp_client lives on one xdist worker (see --dist loadgroup)
+pytestmark = pytest.mark.xdist_group("mitre_baseline")
+
+_TOOL = "agents.saf_stig_generator.services.mitre_baseline.tool"
+
+# The tool searches GitHub through requests, so the mock sits on requests'
+# transport; it is started once for the module and each test registers only
+# the search response it needs.
+GITHUB_MOCK = responses.RequestsMock(assert_all_requests_are_fired=False)
+SEARCH_URL = "https://api.github.com/search/repositories"
+BASELINE_NAME = "redhat-enterprise-linux-9-stig-baseline"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def github_mock():
+    """Activate the GitHub requests mock for the whole module."""
+    with GITHUB_MOCK:
+        yield GITHUB_MOCK
+
+
+@pytest.fixture
+def github_api(github_mock):
+    """The GitHub mock, with this test's responses and calls cleared after it."""
+    yield github_mock
+    github_mock.reset()
+
+
+@pytest.fixture
+def download_dir(monkeypatch, isolated_artifacts_dir):
+    """Clone baselines into a fresh temp directory instead of artifacts/."""
+    monkeypatch.setattr(
+        f"{_TOOL}._get_artifacts_download_dir", lambda: isolated_artifacts_dir
+    )
+    return isolated_artifacts_dir
+
+
+@pytest.fixture
+def baseline_found(github_api, mock_github_api_response):
+    """Answer the search with the RHEL 9 baseline repository."""
+    github_api.get(
+        SEARCH_URL,
+        body=mock_github_api_response.body,
+        content_type="application/json",
+    )
 
 
 class TestMitreBaselineTool:
     """Unit tests for MITRE baseline tool functionality."""
 
     @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.mitre_baseline.tool.subprocess.run")
-    async def test_find_mitre_baseline_success(self, mock_subprocess, mock_context):
-        """Test successful baseline cloning."""
-        # Mock successful git clone
-        mock_subprocess.return_value.returncode = 0
+    async def test_find_mitre_baseline_success(
+        self, baseline_found, download_dir, mock_subprocess, mock_context
+    ):
+        """Test a found baseline is cloned into the download directory."""
         mock_subprocess.return_value.stdout = "Cloning into repository..."
-        mock_subprocess.return_value.stderr = ""
 
-        result_str = await find_mitre_baseline(
-            "Red Hat Enterprise Linux 9", mock_context
+        result_str = await find_mitre_baseline.fn(
+            "RHEL 9 STIG baseline", ctx=mock_context
         )
-        result = json.loads(result_str)
+        result = loads(result_str)
 
         assert result["status"] == "success"
-        assert "path" in result["data"]
-        assert "redhat-enterprise-linux-9-stig-baseline" in result["data"]["path"]
-        mock_context.info.assert_any_call("Successfully cloned baseline repository")
+        assert result["data"]["repositories_cloned"] == 1
+        cloned = result["data"]["cloned_repositories"][0]
+        assert cloned["path"] == str(download_dir / BASELINE_NAME)
+        mock_context.info.assert_any_call(f"Cloning repository: {BASELINE_NAME}")
 
     @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.mitre_baseline.tool.subprocess.run")
     async def test_find_mitre_baseline_clone_failure(
-        self, mock_subprocess, mock_context
+        self, baseline_found, download_dir, mock_subprocess, mock_context
     ):
-        """Test handling of git clone failures."""
-        # Mock failed git clone
-        mock_subprocess.return_value.returncode = 128
-        mock_subprocess.return_value.stdout = ""
-        mock_subprocess.return_value.stderr = "Repository not found"
+        """Test a failed git clone is reported per repository."""
+        # The tool clones with check=True, so git's failure raises
+        mock_subprocess.side_effect = subprocess.CalledProcessError(
+            128, ["git", "clone"], stderr="Repository not found"
+        )
 
-        result_str = await find_mitre_baseline("NonExistent Product", mock_context)
-        result = json.loads(result_str)
+        result_str = await find_mitre_baseline.fn(
+            "RHEL 9 STIG baseline", ctx=mock_context
+        )
+        result = loads(result_str)
 
-        assert result["status"] == "failure"
-        assert "could not be found or cloned" in result["message"]
+        assert result["status"] == "success"
+        assert result["data"]["repositories_cloned"] == 0
+        error = result["data"]["errors"][0]
+        assert error["repo_name"] == BASELINE_NAME
+        assert "Repository not found" in error["error"]
 
     @pytest.mark.asyncio
-    async def test_search_github_for_baseline_success(
-        self, mock_context, mock_github_api_response
+    async def test_find_mitre_baseline_no_results(
+        self, github_api, download_dir, mock_subprocess, mock_context
     ):
-        """Test successful GitHub API search."""
-        async with respx.mock:
-            respx.get("https://api.github.com/search/repositories").respond(
-                200, json=mock_github_api_response
-            )
-
-            result_str = await search_github_for_baseline("RHEL 9", mock_context)
-            result = json.loads(result_str)
-
-            assert result["status"] == "success"
-            assert len(result["data"]["repositories"]) == 1
-            assert (
-                "redhat-enterprise-linux-9-stig-baseline"
-                in result["data"]["repositories"][0]["name"]
-            )
-
-    @pytest.mark.asyncio
-    async def test_search_github_for_baseline_no_results(self, mock_context):
-        """Test GitHub search with no results."""
-        async with respx.mock:
-            respx.get("https://api.github.com/search/repositories").respond(
-                200, json={"items": []}
-            )
+        """Test a search with no results clones nothing."""
+        github_api.get(SEARCH_URL, json={"items": []})
 
-            result_str = await search_github_for_baseline(
-                "Unknown Product", mock_context
-            )
-            result = json.loads(result_str)
+        result_str = await find_mitre_baseline.fn("Unknown Product", ctx=mock_context)
+        result = loads(result_str)
 
-            assert result["status"] == "failure"
-            assert "No MITRE baselines found" in result["message"]
+        assert result["status"] == "not_found"
+        assert result["data"]["repositories_found"] == 0
+        mock_subprocess.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_search_github_api_error(self, mock_context):
+    async def test_find_mitre_baseline_api_error(
+        self, github_api, download_dir, mock_context
+    ):
         """Test GitHub API error handling."""
-        async with respx.mock:
-            respx.get("https://api.github.com/search/repositories").respond(403)
+        github_api.get(SEARCH_URL, status=403)
 
-            result_str = await search_github_for_baseline("RHEL 9", mock_context)
-            result = json.loads(result_str)
+        result_str = await find_mitre_baseline.fn("RHEL 9", ctx=mock_context)
+        result = loads(result_str)
+
+        assert result["status"] == "failure"
+        assert "GitHub API error" in result["message"]
 
-            assert result["status"] == "failure"
-            assert "GitHub API error" in result["message"]
 
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def mcp_client(shared_services):
+    """The session's shared Client, with this module's service included."""
+    return await shared_services.connect(mitre_baseline_server)
 
+
+@pytest.mark.integration
 class TestMitreBaselineToolIntegration:
     """Integration tests for MITRE baseline tool using FastMCP Client."""
 
-    @pytest.fixture
-    def mcp_server(self):
-        """Provide the MITRE baseline MCP server for testing."""
-        return mitre_baseline_server
-
     @pytest.mark.asyncio
-    async def test_tool_via_mcp_client(self, mcp_server, temp_artifacts_dir):
+    async def test_tool_via_mcp_client(
+        self, mcp_client, baseline_found, download_dir, mock_subprocess
+    ):
         """Test the tool through MCP client interface."""
-        with patch(
-            "agents.saf_stig_generator.services.mitre_baseline.tool.subprocess.run"
-        ) as mock_subprocess:
-            mock_subprocess.return_value.returncode = 0
-            mock_subprocess.return_value.stdout = "Cloning..."
-            mock_subprocess.return_value.stderr = ""
-
-            async with Client(mcp_server) as client:
-                result_content, _ = await client.call_tool(
-                    "find_mitre_baseline", {"product_name": "RHEL 9"}
-                )
-                result = json.loads(result_content.text)
-
-                assert result["status"] == "success"
-                assert "path" in result["data"]
+        mock_subprocess.return_value.stdout = "Cloning..."
+
+        result = await mcp_client.call_tool(
+            "find_mitre_baseline", {"query": "RHEL 9 STIG baseline"}
+        )
+        result = loads(result[0].text)
+
+        assert result["status"] == "success"
+        assert result["data"]["repositories_cloned"] == 1
 
     @pytest.mark.asyncio
-    async def test_tool_resources(self, mcp_server):
+    async def test_tool_resources(self, mcp_client):
         """Test tool resources are accessible."""
-        async with Client(mcp_server) as client:
-            # Test version resource
-            version_result = await client.read_resource("mitre-baseline-tool://version")
-            assert "MITRE Baseline Tool v" in version_result.text
-
-            # Test info resource
-            info_result = await client.read_resource("mitre-baseline-tool://info")
-            info_data = json.loads(info_result.text)
-            assert info_data["name"] == "MITRE Baseline Tool"
+        # Read the version and info resources in one concurrent round trip
+        version_result, info_result = await asyncio.gather(
+            mcp_client.read_resource("mitre-baseline-tool://version"),
+            mcp_client.read_resource("mitre-baseline-tool://info"),
+        )
+        assert "MITRE Baseline Tool v" in version_result[0].text
+
+        info_data = loads(info_result[0].text)
+        assert info_data["name"] == "MITRE Baseline Tool"
@@ -2,11 +2,12 @@
 Tests for SAF Generator Tool - comprehensive unit and integration tests.
 """
 
-import json
-from unittest.mock import patch
+import asyncio
+import subprocess
+from types import SimpleNamespace
 
 import pytest
-from fastmcp import Client
+import pytest_asyncio
 
 from agents.saf_stig_generator.services.saf_generator.tool import (
     generate_saf_stub,
@@ -14,125 +15,135 @@ from agents.saf_stig_generator.services.saf_generator.tool import (
 from agents.saf_stig_generator.services.saf_generator.tool import (
     mcp as saf_generator_server,
 )
+from tests.common.context import CtxStub
+from tests.common.jsonutil import loads
+
+# The module-scoped mcp_client lives on one xdist worker (see --dist loadgroup)
+pytestmark = pytest.mark.xdist_group("saf_generator")
+
+
+# generate_saf_stub cases keyed by XCCDF path, so one fake subprocess.run can
+# serve all of them concurrently: (returncode, stdout, stderr) or an exception
+SAF_RUNS = {
+    "/path/to/xccdf.xml": (0, "Successfully generated profile stub", ""),
+    "/path/to/invalid.xml": (1, "", "Error: Invalid XCCDF file"),
+    "/path/to/no-saf.xml": FileNotFoundError(2, "No such file or directory"),
+    "/path/to/large.xml": subprocess.TimeoutExpired("saf", 300),
+}
+
+# Expected failure message fragments for the failing cases
+SAF_FAILURES = {
+    "/path/to/invalid.xml": (
+        "Failed to generate stub. SAF CLI exited with error",
+        "Error: Invalid XCCDF file",
+    ),
+    "/path/to/no-saf.xml": ("'saf' command not found",),
+    "/path/to/large.xml": ("timed out after 300 seconds",),
+}
+
+
+def _fake_saf_run(command, **kwargs):
+    """``subprocess.run`` stand-in that answers from SAF_RUNS.
+
+    The tool runs the SAF CLI with ``check=True``, so a non-zero exit raises
+    ``CalledProcessError`` as the real ``subprocess.run`` would.
+    """
+    outcome = SAF_RUNS[command[command.index("--input") + 1]]
+    if isinstance(outcome, Exception):
+        raise outcome
+    returncode, stdout, stderr = outcome
+    if returncode and kwargs.get("check"):
+        raise subprocess.CalledProcessError(returncode, command, stdout, stderr)
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def generated_dir(monkeypatch, isolated_artifacts_dir):
+    """Point the tool's generated-stub directory at a fresh temp directory."""
+    monkeypatch.setattr(
+        f"{generate_saf_stub.fn.__module__}.get_generated_dir",
+        lambda: isolated_artifacts_dir,
+    )
+    return isolated_artifacts_dir
 
 
 class TestSafGeneratorTool:
     """Unit tests for SAF generator tool functionality."""
 
     @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.saf_generator.tool.subprocess.run")
-    async def test_generate_saf_stub_success(self, mock_subprocess, mock_context):
-        """Test successful SAF stub generation."""
-        # Mock successful saf generate command
-        mock_subprocess.return_value.returncode = 0
-        mock_subprocess.return_value.stdout = "Successfully generated profile stub"
-        mock_subprocess.return_value.stderr = ""
-
-        result_str = await generate_saf_stub(
-            "/path/to/xccdf.xml", "/output/dir", mock_context
+    async def test_generate_saf_stub_cases(self, mock_subprocess, generated_dir):
+        """Run the success and every failure case concurrently."""
+        mock_subprocess.side_effect = _fake_saf_run
+        contexts = {xccdf_path: CtxStub() for xccdf_path in SAF_RUNS}
+
+        results = await asyncio.gather(
+            *(
+                generate_saf_stub.fn(xccdf_path, ctx)
+                for xccdf_path, ctx in contexts.items()
+            )
         )
-        result = json.loads(result_str)
-
-        assert result["status"] == "success"
-        assert "path" in result["data"]
-        assert result["data"]["path"] == "/output/dir"
-        mock_context.info.assert_any_call("Successfully generated SAF stub profile")
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.saf_generator.tool.subprocess.run")
-    async def test_generate_saf_stub_command_failure(
-        self, mock_subprocess, mock_context
-    ):
-        """Test handling of saf command failures."""
-        # Mock failed saf command
-        mock_subprocess.return_value.returncode = 1
-        mock_subprocess.return_value.stdout = ""
-        mock_subprocess.return_value.stderr = "Error: Invalid XCCDF file"
-
-        result_str = await generate_saf_stub(
-            "/path/to/invalid.xml", "/output/dir", mock_context
-        )
-        result = json.loads(result_str)
-
-        assert result["status"] == "failure"
-        assert "Failed to generate SAF stub" in result["message"]
-        assert "Error: Invalid XCCDF file" in result["message"]
-
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.saf_generator.tool.subprocess.run")
-    async def test_generate_saf_stub_file_not_found(
-        self, mock_subprocess, mock_context
-    ):
-        """Test handling when XCCDF file doesn't exist."""
-        # Mock FileNotFoundError when trying to access non-existent file
-        mock_subprocess.side_effect = FileNotFoundError("No such file or directory")
-
-        result_str = await generate_saf_stub(
-            "/nonexistent/file.xml", "/output/dir", mock_context
+        results = dict(zip(SAF_RUNS, map(loads, results)))
+
+        stub_path = str(generated_dir / "xccdf_stub")
+        success = results.pop("/path/to/xccdf.xml")
+        assert success["status"] == "success"
+        assert success["data"]["stub_path"] == stub_path
+        contexts["/path/to/xccdf.xml"].assert_any_info(
+            f"Successfully generated stub at: {stub_path}"
         )
-        result = json.loads(result_str)
 
-        assert result["status"] == "failure"
-        assert "No such file or directory" in result["message"]
+        for xccdf_path, result in results.items():
+            assert result["status"] == "failure", xccdf_path
+            for fragment in SAF_FAILURES[xccdf_path]:
+                assert fragment in result["message"], xccdf_path
 
-    @pytest.mark.asyncio
-    @patch("agents.saf_stig_generator.services.saf_generator.tool.subprocess.run")
-    async def test_generate_saf_stub_timeout(self, mock_subprocess, mock_context):
-        """Test handling of command timeout."""
-        import subprocess
-
-        # Mock timeout error
-        mock_subprocess.side_effect = subprocess.TimeoutExpired("saf", 30)
 
-        result_str = await generate_saf_stub(
-            "/path/to/large.xml", "/output/dir", mock_context
-        )
-        result = json.loads(result_str)
-
-        assert result["status"] == "failure"
-        assert "Command timed out" in result["message"]
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def mcp_client(shared_services):
+    """The session's shared Client, with this module's service included."""
+    return await shared_services.connect(saf_generator_server)
 
 
+@pytest.mark.integration
 class TestSafGeneratorToolIntegration:
     """Integration tests for SAF generator tool using FastMCP Client."""
 
-    @pytest.fixture
-    def mcp_server(self):
-        """Provide the SAF generator MCP server for testing."""
-        return saf_generator_server
-
     @pytest.mark.asyncio
-    async def test_tool_via_mcp_client(self, mcp_server, temp_artifacts_dir):
-        """Test the tool through MCP client interface."""
-        with patch(
-            "agents.saf_stig_generator.services.saf_generator.tool.subprocess.run"
-        ) as mock_subprocess:
-            mock_subprocess.return_value.returncode = 0
-            mock_subprocess.return_value.stdout = "Profile generated successfully"
-            mock_subprocess.return_value.stderr = ""
-
-            async with Client(mcp_server) as client:
-                result_content, _ = await client.call_tool(
+    async def test_tool_via_mcp_client(
+        self, mcp_client, mock_subprocess, generated_dir
+    ):
+        """Test the tool through MCP client interface, all cases in one batch."""
+        mock_subprocess.side_effect = _fake_saf_run
+
+        responses = await asyncio.gather(
+            *(
+                mcp_client.call_tool(
                     "generate_saf_stub",
-                    {
-                        "xccdf_path": "/test/path.xml",
-                        "output_dir": str(temp_artifacts_dir),
-                    },
+                    {"xccdf_path": xccdf_path},
                 )
-                result = json.loads(result_content.text)
+                for xccdf_path in SAF_RUNS
+            )
+        )
+        results = {
+            xccdf_path: loads(result[0].text)
+            for xccdf_path, result in zip(SAF_RUNS, responses)
+        }
 
-                assert result["status"] == "success"
-                assert "path" in result["data"]
+        success = results.pop("/path/to/xccdf.xml")
+        assert success["status"] == "success"
+        assert success["data"]["stub_path"] == str(generated_dir / "xccdf_stub")
+        for xccdf_path, result in results.items():
+            assert result["status"] == "failure", xccdf_path
 
     @pytest.mark.asyncio
-    async def test_tool_resources(self, mcp_server):
+    async def test_tool_resources(self, mcp_client):
         """Test tool resources are accessible."""
-        async with Client(mcp_server) as client:
-            # Test version resource
-            version_result = await client.read_resource("saf-generator-tool://version")
-            assert "SAF Generator Tool v" in version_result.text
-
-            # Test info resource
-            info_result = await client.read_resource("saf-generator-tool://info")
-            info_data = json.loads(info_result.text)
-            assert info_data["name"] == "SAF Generator Tool"
+        # Read the version and info resources in one concurrent round trip
+        version_result, info_result = await asyncio.gather(
+            mcp_client.read_resource("saf-generator-tool://version"),
+            mcp_client.read_resource("saf-generator-tool://info"),
+        )
+        assert "SAF Generator Tool v" in version_result[0].text
+
+        info_data = loads(info_result[0].text)
+        assert info_data["name"] == "SAF Generator Tool"
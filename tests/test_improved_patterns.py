@@ -55,7 +55,7 @@ class TestingPatternExamples:
     def test_fixture_usage_pattern(self):
         """
         Fixture Usage Pattern:
-        - Reusable mock objects (mock_context, mock_docker_client)
+        - Reusable mock objects (mock_context, ctx_stub)
         - Test data fixtures (sample_stig_data, disa_downloads_page)
         - HTTP mocking fixtures (mock_http_api)
         - Proper scope management (session, function, class)
@@ -77,9 +77,11 @@ if __name__ == "__main__":
     # Run the improved tests
     pytest.main(
         [
-            "tests/services/test_memory_tool_improved.py",
-            "tests/services/test_disa_stig_tool_improved.py",
-            "tests/services/test_docker_tool_improved.py",
+            "tests/services",
+            "-n",
+            "auto",
+            "--dist",
+            "loadgroup",
             "-v",
             "--tb=short",
         ]
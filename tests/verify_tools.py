@@ -24,15 +24,16 @@ def test_imports():
         ("Memory", "agents.saf_stig_generator.services.memory.tool"),
     ]
 
+    failures = {}
     for tool_name, module_path in tools:
         try:
             __import__(module_path)
             print(f"   ✅ {tool_name} tool")
         except ImportError as e:
             print(f"   ❌ {tool_name} tool: {e}")
-            return False
+            failures[tool_name] = str(e)
 
-    return True
+    assert not failures, f"Tools failed to import: {failures}"
 
 
 def test_resource_endpoints():
@@ -49,36 +50,30 @@ def test_resource_endpoints():
         get_version as saf_version,
     )
 
-    try:
-        print(f"   ✅ DISA STIG: {disa_version()}")
-        print(f"   ✅ SAF Generator: {saf_version()}")
-        print(f"   ✅ Memory: {memory_version()}")
-        return True
-    except Exception as e:
-        print(f"   ❌ Resource endpoint error: {e}")
-        return False
+    for name, get_version in [
+        ("DISA STIG", disa_version),
+        ("SAF Generator", saf_version),
+        ("Memory", memory_version),
+    ]:
+        version = get_version.fn()
+        assert version, f"{name} returned an empty version"
+        print(f"   ✅ {name}: {version}")
 
 
 def test_basic_functionality():
     """Test basic functionality without external dependencies."""
     print("\n⚙️  Testing basic functionality...")
 
-    try:
-        # Test that we can create mock contexts (used in tests)
-        from unittest.mock import AsyncMock
+    # Test that we can import test utilities and create the context
+    # stand-in the tests pass to tools (a plain recorder, no mock spec)
+    from tests.common.context import CtxStub
+    from tests.common.jsonutil import loads
 
-        mock_context = AsyncMock()
-        mock_context.info = AsyncMock()
-        mock_context.error = AsyncMock()
-        print("   ✅ Mock context creation")
+    CtxStub()
+    print("   ✅ Context stub creation")
 
-        # Test that we can import test utilities
-        print("   ✅ Test fixtures available")
-
-        return True
-    except Exception as e:
-        print(f"   ❌ Basic functionality error: {e}")
-        return False
+    assert loads("{}") == {}
+    print("   ✅ Test fixtures available")
 
 
 def main():
@@ -95,8 +90,13 @@ def main():
         test_basic_functionality,
     ]
 
+    # The checks assert, so pytest can also run this file directly
+    # (pytest tests/verify_tools.py) and cache which ones failed
     for test_func in tests:
-        if not test_func():
+        try:
+            test_func()
+        except Exception as e:
+            print(f"   ❌ {test_func.__name__}: {e}")
             all_tests_passed = False
 
     print("\n" + "=" * 50)